@@ -20,6 +20,7 @@ from telethon.errors import FloodWaitError
 from src.config import Config
 from src.logger import get_logger
 from src.rule import ForwardingRule, save_rules_to_config
+from src.utils import new_event_loop
 from src.i18n import t
 
 logger = get_logger()
@@ -44,7 +45,7 @@ class AdminBotManager:
     def run(self) -> None:
         """Run Admin Bot in a separate thread (blocking)"""
         try:
-            self.loop = asyncio.new_event_loop()
+            self.loop = new_event_loop()
             asyncio.set_event_loop(self.loop)
             self.loop.run_until_complete(self._start())
         except Exception as e:
@@ -611,8 +612,7 @@ class AdminBotManager:
     def _save_rules(self, rules: List[ForwardingRule]) -> None:
         """Save rules to config file"""
         rules_data = save_rules_to_config(rules)
-        self.config.config_data.update(rules_data)
-        self.config.save()
+        self.config.update(rules_data)
 
     @staticmethod
     def _parse_chat_ids(value: str) -> list:
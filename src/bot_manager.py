@@ -3,19 +3,24 @@ Bot Lifecycle Management Module
 Manages the startup, shutdown, and restart of Telegram Bot
 """
 import asyncio
+import logging
 import time
 import threading
-from typing import Optional
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
 from src.config import Config
 from src.client import TelegramClientManager
 from src.filters import MessageFilter
-from src.forwarder import MessageForwarder
+from src.forwarder import MediaGroupCollector, MessageForwarder, RateLimiter
 from src.logger import get_logger
+from src.utils import get_message_preview, new_event_loop
 from src.i18n import t
 from src.constants import (
     BOT_STOP_TIMEOUT,
     BOT_RESTART_DELAY,
     BOT_MAIN_LOOP_INTERVAL,
+    ENTITY_NAME_CACHE_SIZE,
+    ENTITY_NAME_CACHE_TTL,
     UI_UPDATE_DEBOUNCE
 )
 
@@ -36,6 +41,8 @@ class BotManager:
         self.auth_manager = auth_manager
         self.client_manager: Optional[TelegramClientManager] = None
         self.forwarder: Optional[MessageForwarder] = None
+        # Album collection shared by all rules, so every rule gets the whole group
+        self.media_groups: Optional[MediaGroupCollector] = None
         self.thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         # Thread-safe state management
@@ -48,6 +55,9 @@ class BotManager:
         self._last_update_time = 0.0
         # Authenticated user info
         self._auth_success_user_info: Optional[str] = None
+        # Display names for the "message received" log: {id: (name, expiry)}, least recently used first
+        self._chat_names: OrderedDict = OrderedDict()
+        self._sender_names: OrderedDict = OrderedDict()
 
     @property
     def is_running(self) -> bool:
@@ -98,7 +108,7 @@ class BotManager:
         """Run Bot in a separate thread"""
         try:
             # Create new event loop
-            self.loop = asyncio.new_event_loop()
+            self.loop = new_event_loop()
             asyncio.set_event_loop(self.loop)
 
             # Run Bot
@@ -138,28 +148,34 @@ class BotManager:
             if self.config.session_type == "user" and self.auth_manager:
                 state_info = self.auth_manager.get_state()
                 if state_info["state"] == "success":
-                    try:
-                        from telethon.tl.types import User
-                        client = self.client_manager.get_client()
-                        if client:
-                            me: User = await client.get_me()
-                            # Build username (including first and last name)
-                            full_name = ' '.join(filter(None, [me.first_name, me.last_name]))
-                            user_info = t("misc.login_success", name=full_name)
-                            if me.username:
-                                user_info += f" (@{me.username})"
-                            if me.id:
-                                user_info += f" ID: {me.id}"
-                            self.set_auth_success_user_info(user_info)
-                            self.trigger_ui_update()  # Trigger UI update
-                    except Exception as e:
-                        logger.warning(t("log.bot.user_info_failed", error=str(e)))
+                    # User info was already fetched (or loaded from cache) by connect(), no get_me() here
+                    user = self.client_manager.user
+                    if user:
+                        # Build username (including first and last name)
+                        first_name, last_name = user.get("first_name"), user.get("last_name")
+                        if first_name and last_name:
+                            full_name = f"{first_name} {last_name}"
+                        else:
+                            full_name = first_name or last_name or ""
+                        parts = [t("misc.login_success", name=full_name)]
+                        if user.get("username"):
+                            parts.append(f" (@{user['username']})")
+                        if user.get("id"):
+                            parts.append(f" ID: {user['id']}")
+                        self.set_auth_success_user_info(''.join(parts))
+                        self.trigger_ui_update()  # Trigger UI update
 
             # Create filter and forwarder for each enabled rule
             rules = self.config.get_enabled_rules()
             self.forwarders = []  # Store all forwarders
             self.rule_forwarder_map = {}  # Rule name -> (rule, filter, forwarder)
             all_source_chats = set()  # Collect all source chats
+            self.media_groups = MediaGroupCollector(self.client_manager.get_client())
+            # Telegram limits sends per account: all rules draw from the same buckets
+            rate_limiter = RateLimiter(
+                per_chat_per_minute=self.config.rate_limit_per_chat,
+                global_per_second=self.config.rate_limit_global,
+            )
 
             for rule in rules:
                 # Create filter
@@ -173,6 +189,7 @@ class BotManager:
                     media_types=rule.filter_media_types,
                     max_file_size=rule.filter_max_file_size,
                     min_file_size=rule.filter_min_file_size,
+                    use_re2=rule.filter_use_re2,
                 )
 
                 # Create forwarder
@@ -181,6 +198,7 @@ class BotManager:
                     rule=rule,
                     message_filter=message_filter,
                     bot_manager=self,
+                    rate_limiter=rate_limiter,
                 )
                 self.forwarders.append(forwarder)
                 self.rule_forwarder_map[rule.name] = (rule, message_filter, forwarder)
@@ -214,34 +232,32 @@ class BotManager:
     
     async def _central_message_handler(self, event) -> None:
         """Central message handler: checks all rules, outputs log only once"""
-        from src.utils import get_media_description
-
         message = event.message
         chat_id = event.chat_id
         sender_id = event.sender_id
 
-        # Build source label (prioritize Telethon entity cache, usually no extra request)
-        chat = await event.get_chat()
-        chat_title = getattr(chat, 'title', None) or str(chat_id)
-        sender = await event.get_sender()
-        if sender:
-            sender_name = ' '.join(filter(None, [
-                getattr(sender, 'first_name', None),
-                getattr(sender, 'last_name', None),
-            ])) or str(sender_id)
-        else:
-            sender_name = str(sender_id)
-
-        # Get message preview
-        raw_text = message.text or get_media_description(message)
-        raw_text = raw_text.replace('\n', ' ')
-        message_preview = f"{raw_text[:50]}..." if len(raw_text) > 50 else raw_text
-
-        # Output "message received" log
-        logger.info(t("log.bot.message_received",
-                      chat=chat_title, chat_id=chat_id,
-                      sender=sender_name, sender_id=sender_id,
-                      preview=message_preview))
+        # "Message received" log only: skip entity lookups and preview when INFO is disabled
+        if logger.isEnabledFor(logging.INFO):
+            # Build source label (names are cached per ID, entities fetched only on a miss)
+            chat_title = await self._cached_name(self._chat_names, chat_id, self._fetch_chat_title, event)
+            sender_name = await self._cached_name(self._sender_names, sender_id, self._fetch_sender_name, event)
+
+            # Get message preview
+            raw_text = get_message_preview(message)
+            message_preview = f"{raw_text[:50]}..." if len(raw_text) > 50 else raw_text
+
+            logger.info(t("log.bot.message_received",
+                          chat=chat_title, chat_id=chat_id,
+                          sender=sender_name, sender_id=sender_id,
+                          preview=message_preview))
+
+        # Collect the whole media group once, before any rule sees it: collecting per rule
+        # would hand each later album message to whichever rule's collection is open
+        messages = None
+        if message.grouped_id:
+            messages = await self.media_groups.get_messages(message)
+            if messages is None:
+                return  # Part of a media group already being collected and dispatched
 
         # Find all rules matching this message
         matched_rules = []
@@ -257,9 +273,10 @@ class BotManager:
                     filtered_by.append((rule.name, forwarder))
 
         if not matched_rules:
-            rules_str = ', '.join(name for name, _ in filtered_by) if filtered_by else t("misc.no_match_rules")
-            group_tag = f" gid={message.grouped_id}" if message.grouped_id else ""
-            logger.debug(t("log.bot.message_filtered", rules=rules_str, group_tag=group_tag))
+            if logger.isEnabledFor(logging.DEBUG):
+                rules_str = ', '.join(name for name, _ in filtered_by) if filtered_by else t("misc.no_match_rules")
+                group_tag = f" gid={message.grouped_id}" if message.grouped_id else ""
+                logger.debug(t("log.bot.message_filtered", rules=rules_str, group_tag=group_tag))
             # Update filter count for each rule
             for _, forwarder in filtered_by:
                 forwarder.filtered_count += 1
@@ -267,12 +284,47 @@ class BotManager:
 
         # Forward to all matching rules
         for rule, forwarder in matched_rules:
-            await forwarder.handle_message(event)
+            await forwarder.handle_message(event, messages)
     
+    @staticmethod
+    async def _cached_name(
+        cache: OrderedDict, key, fetch: Callable[..., Awaitable[str]], event
+    ) -> str:
+        """Get a display name from the LRU cache, fetching it on a miss or after it expires"""
+        now = time.monotonic()
+        entry = cache.get(key)
+        if entry is not None and now < entry[1]:
+            cache.move_to_end(key)
+            return entry[0]
+
+        name = await fetch(event)
+        cache[key] = (name, now + ENTITY_NAME_CACHE_TTL)
+        cache.move_to_end(key)
+        if len(cache) > ENTITY_NAME_CACHE_SIZE:
+            cache.popitem(last=False)
+        return name
+
+    @staticmethod
+    async def _fetch_chat_title(event) -> str:
+        """Get chat title (prioritize Telethon entity cache, usually no extra request)"""
+        chat = await event.get_chat()
+        return getattr(chat, 'title', None) or str(event.chat_id)
+
+    @staticmethod
+    async def _fetch_sender_name(event) -> str:
+        """Get sender full name, falls back to sender ID"""
+        sender = await event.get_sender()
+        if sender:
+            return ' '.join(filter(None, [
+                getattr(sender, 'first_name', None),
+                getattr(sender, 'last_name', None),
+            ])) or str(event.sender_id)
+        return str(event.sender_id)
+
     def trigger_ui_update(self):
         """Trigger UI update (called by forwarder after forwarding)"""
         with self._lock:
-            now = time.time()
+            now = time.monotonic()
             if now - self._last_update_time >= UI_UPDATE_DEBOUNCE:
                 self._ui_update_flag.set()
                 self._last_update_time = now
@@ -3,9 +3,13 @@ Telegram Client Management Module
 Encapsulates Telethon client, handles connection and session management
 """
 import asyncio
+import json
+import logging
+from collections import namedtuple
+from functools import partial
 from pathlib import Path
-from typing import Optional, Callable
-from urllib.parse import urlparse
+from typing import Dict, Optional, Callable
+from urllib.parse import urlsplit
 from telethon import TelegramClient, events
 from telethon.errors import (
     SessionPasswordNeededError,
@@ -16,11 +20,24 @@ from telethon.errors import (
 )
 from telethon.tl.types import User
 from src.config import Config
+from src.constants import DIALOG_WARMUP_LIMIT
 from src.logger import get_logger
 from src.i18n import t
 
 logger = get_logger()
 
+# Authentication errors: exception type -> (log key, auth state message key)
+_AUTH_ERRORS = {
+    PhoneNumberInvalidError: ("log.client.phone_invalid", "message.auth.phone_invalid_error"),
+    PhoneCodeInvalidError: ("log.client.code_invalid", "message.auth.code_invalid_error"),
+    PasswordHashInvalidError: ("log.client.password_invalid", "message.auth.password_invalid_error"),
+    TimeoutError: ("log.client.auth_timeout", None),
+}
+_AUTH_ERROR_TYPES = tuple(_AUTH_ERRORS)
+
+# Proxy tuple in the positional layout Telethon expects
+ProxyConfig = namedtuple("ProxyConfig", "proxy_type addr port rdns username password")
+
 
 class TelegramClientManager:
     """Telegram Client Manager"""
@@ -37,6 +54,18 @@ class TelegramClientManager:
         self.auth_manager = auth_manager
         self.client: Optional[TelegramClient] = None
         self.is_connected = False
+        # Logged-in user info (User mode): {"id", "first_name", "last_name", "username"}
+        self.user: Optional[dict] = None
+        # NewMessage event builders keyed by chat tuple
+        self._filter_cache: Dict[Optional[tuple], events.NewMessage] = {}
+
+        # Handler log templates, resolved once and formatted lazily by logging
+        self._flood_wait_msg = t("log.client.flood_wait", seconds="%s")
+        self._message_error_msg = t("log.client.message_error", error="%s")
+
+        # Parsed proxy, reused while PROXY_URL is unchanged
+        self._proxy_url: Optional[str] = None
+        self._proxy: Optional[ProxyConfig] = None
 
         # Ensure session directory exists
         session_dir = Path("sessions")
@@ -44,19 +73,33 @@ class TelegramClientManager:
 
         # Session file path
         self.session_name = session_dir / "telegram_session"
+        self._session_str = str(self.session_name)
+
+        # Cached user info file (avoids get_me() round-trip on startup)
+        self._user_cache_file = session_dir / "telegram_session.user.json"
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._warm_task: Optional[asyncio.Task] = None
     
-    def _parse_proxy(self) -> Optional[tuple]:
+    def _parse_proxy(self) -> Optional[ProxyConfig]:
         """
-        Parse proxy configuration
+        Parse proxy configuration (cached per proxy URL)
 
         Returns:
-            (proxy_type, proxy_host, proxy_port) or None
+            ProxyConfig (proxy_type, addr, port, rdns, username, password) or None
         """
-        if not self.config.proxy_url:
+        proxy_url = self.config.proxy_url
+        if not proxy_url:
             return None
-        
+
+        if proxy_url != self._proxy_url:
+            self._proxy = self._build_proxy(proxy_url)
+            self._proxy_url = proxy_url
+        return self._proxy
+
+    def _build_proxy(self, proxy_url: str) -> Optional[ProxyConfig]:
+        """Build proxy tuple from proxy URL"""
         try:
-            parsed = urlparse(self.config.proxy_url)
+            parsed = urlsplit(proxy_url)
             proxy_type = parsed.scheme.lower()
             
             if proxy_type not in ['socks5', 'http', 'socks4']:
@@ -83,7 +126,7 @@ class TelegramClientManager:
 
             logger.info(t("log.client.proxy_using", type=proxy_type, host=proxy_host, port=proxy_port))
 
-            return (proxy_type, proxy_host, proxy_port, True, proxy_username, proxy_password)
+            return ProxyConfig(proxy_type, proxy_host, proxy_port, True, proxy_username, proxy_password)
 
         except Exception as e:
             logger.error(t("log.client.proxy_parse_failed", error=str(e)))
@@ -108,7 +151,7 @@ class TelegramClientManager:
                     return False
                 
                 self.client = TelegramClient(
-                    str(self.session_name),
+                    self._session_str,
                     self.config.api_id,
                     self.config.api_hash,
                     proxy=proxy
@@ -117,68 +160,62 @@ class TelegramClientManager:
                 await self.client.start(bot_token=self.config.bot_token)
                 logger.info(t("log.client.bot_connected"))
             else:
-                # User mode
+                # User mode requires AuthManager for the login callbacks
+                auth_manager = self.auth_manager
+                if auth_manager is None:
+                    logger.error(t("log.client.auth_manager_required"))
+                    return False
+
                 self.client = TelegramClient(
-                    str(self.session_name),
+                    self._session_str,
                     self.config.api_id,
                     self.config.api_hash,
                     proxy=proxy
                 )
 
                 # Check if session file exists
-                from pathlib import Path
-                session_file = Path(f"{self.session_name}.session")
+                session_file = Path(f"{self._session_str}.session")
                 has_session = session_file.exists()
 
                 try:
                     # If session exists, set "connecting" state; otherwise state will be set in callback
                     if has_session:
-                        self.auth_manager.set_state("connecting", "")
+                        auth_manager.set_state("connecting", "")
                         logger.info(t("log.client.session_detected"))
 
                     # Use callback for authentication
                     await self.client.start(
-                        phone=self.auth_manager.phone_callback,
-                        code_callback=self.auth_manager.code_callback,
-                        password=self.auth_manager.password_callback
+                        phone=auth_manager.phone_callback,
+                        code_callback=auth_manager.code_callback,
+                        password=auth_manager.password_callback
                     )
 
-                    # Get user info
-                    me: User = await self.client.get_me()
-                    logger.info(t("log.client.user_logged_in", name=me.first_name, username=me.username))
-
-                    # Build user info (including first and last name)
-                    full_name = ' '.join(filter(None, [me.first_name, me.last_name]))
-                    user_info = full_name
-                    if me.username:
-                        user_info += f" (@{me.username})"
-                    if me.id:
-                        user_info += f" [ID: {me.id}]"
+                    # Get user info (from cache if session was reused)
+                    cached = self._load_cached_user() if has_session else None
+                    if cached:
+                        user = cached
+                        self._refresh_task = asyncio.create_task(self._refresh_me())
+                        self._warm_task = asyncio.create_task(self._warm_cache())
+                    else:
+                        # Overlap get_me() with the dialog prefetch round-trip
+                        me, _ = await asyncio.gather(self.client.get_me(), self._warm_cache())
+                        user = self._save_cached_user(me)
+                    self.user = user
+                    logger.info(t("log.client.user_logged_in", name=user.get("first_name"), username=user.get("username")))
 
                     # Save user info to AuthManager
-                    self.auth_manager.set_user_info(user_info)
+                    auth_manager.set_user_info(self._format_user_info(user))
 
                     # Set authentication success state
-                    self.auth_manager.set_state("success")
-
-                except PhoneNumberInvalidError:
-                    logger.error(t("log.client.phone_invalid"))
-                    self.auth_manager.set_state("error", t("message.auth.phone_invalid_error"))
-                    return False
-
-                except PhoneCodeInvalidError:
-                    logger.error(t("log.client.code_invalid"))
-                    self.auth_manager.set_state("error", t("message.auth.code_invalid_error"))
-                    return False
-
-                except PasswordHashInvalidError:
-                    logger.error(t("log.client.password_invalid"))
-                    self.auth_manager.set_state("error", t("message.auth.password_invalid_error"))
-                    return False
+                    auth_manager.set_state("success")
 
-                except TimeoutError as e:
-                    logger.error(t("log.client.auth_timeout", error=str(e)))
-                    self.auth_manager.set_state("error", str(e))
+                except _AUTH_ERROR_TYPES as e:
+                    log_key, message_key = next(
+                        keys for error_type, keys in _AUTH_ERRORS.items() if isinstance(e, error_type)
+                    )
+                    logger.error(t(log_key, error=str(e)))
+                    # No message key: the exception text is shown as-is
+                    auth_manager.set_state("error", t(message_key) if message_key else str(e))
                     return False
             
             self.is_connected = True
@@ -188,6 +225,59 @@ class TelegramClientManager:
             logger.error(t("log.client.connect_failed", error=str(e)))
             return False
     
+    @staticmethod
+    def _format_user_info(user: dict) -> str:
+        """Build user info string (including first and last name)"""
+        first_name, last_name = user.get("first_name"), user.get("last_name")
+        # Most users only have a first name
+        full_name = f"{first_name} {last_name}" if first_name and last_name else (first_name or last_name or "")
+        parts = [full_name]
+        if user.get("username"):
+            parts.append(f" (@{user['username']})")
+        if user.get("id"):
+            parts.append(f" [ID: {user['id']}]")
+        return ''.join(parts)
+
+    def _load_cached_user(self) -> Optional[dict]:
+        """Load cached user info, returns None if missing or unreadable"""
+        try:
+            with open(self._user_cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cached_user(self, me: User) -> dict:
+        """Persist user info next to the session file and return it"""
+        user = {
+            "id": me.id,
+            "first_name": me.first_name,
+            "last_name": me.last_name,
+            "username": me.username,
+        }
+        try:
+            with open(self._user_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(user, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(t("log.client.user_cache_failed", error=str(e)))
+        return user
+
+    async def _refresh_me(self) -> None:
+        """Refresh cached user info in background"""
+        try:
+            me: User = await self.client.get_me()
+            if me:
+                user = self.user = self._save_cached_user(me)
+                self.auth_manager.set_user_info(self._format_user_info(user))
+        except Exception as e:
+            logger.warning(t("log.client.user_cache_failed", error=str(e)))
+
+    async def _warm_cache(self) -> None:
+        """Prefetch recent dialogs so chat entities are in Telethon's cache"""
+        try:
+            await self.client.get_dialogs(limit=DIALOG_WARMUP_LIMIT)
+        except Exception as e:
+            logger.warning(t("log.client.warm_cache_failed", error=str(e)))
+
     async def disconnect(self) -> None:
         """Disconnect"""
         if self.client:
@@ -211,19 +301,28 @@ class TelegramClientManager:
             logger.error(t("log.client.client_not_initialized"))
             return
         
-        # Register new message event handler
-        @self.client.on(events.NewMessage(chats=chats))
-        async def handler(event):
-            try:
-                await callback(event)
-            except FloodWaitError as e:
-                logger.warning(t("log.client.flood_wait", seconds=e.seconds))
-                await asyncio.sleep(e.seconds)
-            except Exception as e:
-                logger.error(t("log.client.message_error", error=str(e)), exc_info=True)
-
-        logger.info(t("log.client.handler_registered", count=len(chats) if chats else t("misc.all_media_types")))
+        # Reuse the event builder for the same chat list
+        key = tuple(chats) if chats else None
+        event_filter = self._filter_cache.get(key)
+        if event_filter is None:
+            event_filter = self._filter_cache[key] = events.NewMessage(chats=chats)
+
+        # Register new message event handler (callback bound per registration)
+        self.client.add_event_handler(partial(self._dispatch, callback), event_filter)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(t("log.client.handler_registered", count=len(chats) if chats else t("misc.all_media_types")))
     
+    async def _dispatch(self, callback: Callable, event) -> None:
+        """Invoke a registered message callback, handling rate limits and errors"""
+        try:
+            await callback(event)
+        except FloodWaitError as e:
+            logger.warning(self._flood_wait_msg, e.seconds)
+            await asyncio.sleep(e.seconds)
+        except Exception as e:
+            logger.error(self._message_error_msg, e, exc_info=True)
+
     async def run_until_disconnected(self) -> None:
         """Run client until disconnected"""
         if self.client:
@@ -240,18 +339,21 @@ class TelegramClientManager:
         return self.client
 
     def clear_session(self) -> None:
-        """Clear session file"""
+        """Clear session files (session database, journal/WAL files and user cache)"""
         try:
             import os
-            session_files = [
-                f"{self.session_name}.session",
-                f"{self.session_name}.session-journal"
-            ]
-
-            for session_file in session_files:
-                if os.path.exists(session_file):
-                    os.remove(session_file)
-                    logger.info(t("log.client.session_deleted", file=session_file))
+            prefix = f"{self.session_name.name}."
+
+            # One directory read; DirEntry already knows the file type
+            with os.scandir(self.session_name.parent) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(prefix) or not entry.is_file():
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        continue
+                    logger.info(t("log.client.session_deleted", file=entry.path))
 
             logger.info(t("log.client.session_cleared"))
         except Exception as e:
@@ -3,16 +3,67 @@ Configuration loading and validation module
 Supports loading configuration from .env and config.yaml
 """
 import os
-import yaml
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dotenv import load_dotenv
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from src.logger import get_logger
 from src.rule import ForwardingRule, load_rules_from_config
 from src.i18n import t
 
 logger = get_logger()
 
+# Parsed YAML cache: {resolved path: ((mtime_ns, size), data)}
+_YAML_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+# Loaded .env files: {resolved path: mtime_ns}
+_ENV_MTIME: Dict[str, int] = {}
+
+# Shared empty default for unconfigured list settings (avoids allocating a new [] per access)
+_EMPTY: tuple = ()
+
+
+@lru_cache(maxsize=None)
+def _yaml_codec() -> tuple:
+    """
+    Import PyYAML on first use and pick loader/dumper
+
+    Prefers the libyaml C implementation, falls back to pure Python
+
+    Returns:
+        (yaml module, Loader class, Dumper class)
+    """
+    import yaml
+    if hasattr(yaml, "CSafeLoader"):
+        return yaml, yaml.CSafeLoader, yaml.CSafeDumper
+
+    logger.warning(t("log.config.libyaml_unavailable"))
+    return yaml, yaml.SafeLoader, yaml.SafeDumper
+
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    """
+    Read YAML file, reusing the parsed result while its mtime and size are unchanged
+
+    Args:
+        path: YAML file path
+
+    Returns:
+        Parsed data, shared with the cache: treat it as read-only
+    """
+    key = str(path.resolve())
+    stat = path.stat()
+    # Size is part of the stamp: coarse mtimes (e.g. some bind mounts) may not change on a quick rewrite
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    yaml, loader, _ = _yaml_codec()
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=loader) or {}
+    _YAML_CACHE[key] = (stamp, data)
+    return data
+
 
 class Config:
     """Configuration management class"""
@@ -34,31 +85,59 @@ class Config:
     
     def load(self) -> None:
         """Load all configuration"""
+        # Environment values are cached on first access, re-read them after reload
+        self.clear_cache()
+
         # Load environment variables
         env_path = Path(self.env_file)
-        if env_path.exists():
-            load_dotenv(env_path)
-            logger.info(t("log.config.env_loaded", path=env_path))
-        else:
+        try:
+            env_mtime = env_path.stat().st_mtime_ns
+        except OSError:
             logger.warning(t("log.config.env_not_found", path=env_path))
+        else:
+            # Skip re-parsing .env when it has not changed since the last load
+            key = str(env_path.resolve())
+            if _ENV_MTIME.get(key) != env_mtime:
+                from dotenv import load_dotenv
+                load_dotenv(env_path)
+                _ENV_MTIME[key] = env_mtime
+                logger.info(t("log.config.env_loaded", path=env_path))
 
         # Load YAML configuration
         config_path = Path(self.config_file)
         if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.config_data = yaml.safe_load(f) or {}
+            self.config_data = _read_yaml(config_path)
             logger.info(t("log.config.yaml_loaded", path=config_path))
         else:
             logger.warning(t("log.config.yaml_not_found", path=config_path))
             self.config_data = {}
+
+        self._snapshot_sections()
+
+    def _snapshot_sections(self) -> None:
+        """Cache top-level filters/ignore/forwarding/rate_limit sections (missing or null -> {})"""
+        self._filters: Dict[str, Any] = self.config_data.get("filters") or {}
+        self._ignore: Dict[str, Any] = self.config_data.get("ignore") or {}
+        self._forwarding: Dict[str, Any] = self.config_data.get("forwarding") or {}
+        self._rate_limit: Dict[str, Any] = self.config_data.get("rate_limit") or {}
     
+    def clear_cache(self) -> None:
+        """Drop cached environment values so they are re-read on next access"""
+        for name, attr in vars(type(self)).items():
+            if isinstance(attr, cached_property):
+                self.__dict__.pop(name, None)
+
     def save(self) -> None:
         """Save configuration to YAML file"""
         config_path = Path(self.config_file)
         config_path.parent.mkdir(parents=True, exist_ok=True)
 
+        yaml, _, dumper = _yaml_codec()
         with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self.config_data, f, allow_unicode=True, default_flow_style=False)
+            yaml.dump(self.config_data, f, Dumper=dumper, allow_unicode=True, default_flow_style=False)
+
+        # The file changed under the cached parse, force the next load to re-read it
+        _YAML_CACHE.pop(str(config_path.resolve()), None)
 
         logger.debug(t("log.config.saved", path=config_path))
     
@@ -69,82 +148,84 @@ class Config:
         Args:
             new_config: New configuration data
         """
-        self.config_data.update(new_config)
+        # Replace rather than mutate: config_data may be the cached parse of the file
+        self.config_data = {**self.config_data, **new_config}
+        self._snapshot_sections()
         self.save()
 
     # Telegram API configuration
-    @property
+    @cached_property
     def api_id(self) -> Optional[int]:
         """Telegram API ID"""
         api_id = os.getenv("API_ID")
         return int(api_id) if api_id else None
     
-    @property
+    @cached_property
     def api_hash(self) -> Optional[str]:
         """Telegram API Hash"""
         return os.getenv("API_HASH")
     
-    @property
+    @cached_property
     def bot_token(self) -> Optional[str]:
         """Telegram Bot Token"""
         return os.getenv("BOT_TOKEN")
     
-    @property
+    @cached_property
     def session_type(self) -> str:
         """Session type: user or bot"""
         return os.getenv("SESSION_TYPE", "user")
     
-    @property
+    @cached_property
     def proxy_url(self) -> Optional[str]:
         """Proxy URL (optional)"""
         return os.getenv("PROXY_URL") or None
 
     # Web service configuration
-    @property
+    @cached_property
     def web_host(self) -> str:
         """Web service host"""
         return os.getenv("WEB_HOST", "0.0.0.0")
     
-    @property
+    @cached_property
     def web_port(self) -> int:
         """Web service port"""
         return int(os.getenv("WEB_PORT", "8080"))
     
-    @property
+    @cached_property
     def web_auth_username(self) -> str:
         """Web authentication username"""
         return os.getenv("WEB_AUTH_USERNAME", "")
     
-    @property
+    @cached_property
     def web_auth_password(self) -> str:
         """Web authentication password"""
         return os.getenv("WEB_AUTH_PASSWORD", "")
 
     # Logging configuration
-    @property
+    @cached_property
     def log_level(self) -> str:
         """Log level"""
         return os.getenv("LOG_LEVEL", "INFO")
 
     # Language configuration
-    @property
+    @cached_property
     def language(self) -> str:
         """Interface language"""
         return os.getenv("LANGUAGE", "zh_CN")
 
     # Admin Bot configuration
-    @property
+    @cached_property
     def admin_bot_token(self) -> Optional[str]:
         """Admin Bot Token for managing via Telegram commands"""
         return os.getenv("ADMIN_BOT_TOKEN") or None
 
-    @property
+    @cached_property
     def admin_chat_id(self) -> Optional[int]:
         """Admin Chat ID (only this user can use management commands)"""
         val = os.getenv("ADMIN_CHAT_ID")
         return int(val) if val else None
 
-    @property
+    @cached_property
     def webapp_url(self) -> Optional[str]:
         """WebApp URL for Telegram Mini App (must be HTTPS)"""
         return os.getenv("WEBAPP_URL") or None
@@ -162,74 +243,74 @@ class Config:
 
     # Filter rules configuration
     @property
-    def filter_regex_patterns(self) -> List[str]:
+    def filter_regex_patterns(self) -> Sequence[str]:
         """Regular expression filter rules"""
-        filters = self.config_data.get("filters", {})
-        return filters.get("regex_patterns", [])
+        return self._filters.get("regex_patterns") or _EMPTY
     
     @property
-    def filter_keywords(self) -> List[str]:
+    def filter_keywords(self) -> Sequence[str]:
         """Keyword filter rules"""
-        filters = self.config_data.get("filters", {})
-        return filters.get("keywords", [])
+        return self._filters.get("keywords") or _EMPTY
     
     @property
     def filter_mode(self) -> str:
         """Filter mode: whitelist or blacklist"""
-        filters = self.config_data.get("filters", {})
-        return filters.get("mode", "whitelist")
+        return self._filters.get("mode", "whitelist")
     
     @property
-    def filter_media_types(self) -> List[str]:
+    def filter_media_types(self) -> Sequence[str]:
         """Allowed media types list (empty = all allowed)"""
-        filters = self.config_data.get("filters", {})
-        return filters.get("media_types", [])
+        return self._filters.get("media_types") or _EMPTY
     
     @property
     def filter_max_file_size(self) -> int:
         """Maximum file size (bytes), 0 = no limit"""
-        filters = self.config_data.get("filters", {})
-        return int(filters.get("max_file_size", 0))
+        return int(self._filters.get("max_file_size", 0))
     
     @property
     def filter_min_file_size(self) -> int:
         """Minimum file size (bytes)"""
-        filters = self.config_data.get("filters", {})
-        return int(filters.get("min_file_size", 0))
+        return int(self._filters.get("min_file_size", 0))
 
     # Ignore list configuration
     @property
     def ignored_user_ids(self) -> List[int]:
         """Ignored user ID list"""
-        ignore = self.config_data.get("ignore", {})
-        user_ids = ignore.get("user_ids", [])
+        user_ids = self._ignore.get("user_ids") or _EMPTY
         # Ensure conversion to integer list, filter out None values
         return [int(uid) for uid in user_ids if uid is not None]
     
     @property
-    def ignored_keywords(self) -> List[str]:
+    def ignored_keywords(self) -> Sequence[str]:
         """Ignored keywords list"""
-        ignore = self.config_data.get("ignore", {})
-        return ignore.get("keywords", [])
+        return self._ignore.get("keywords") or _EMPTY
 
     # Forwarding options configuration
     @property
     def preserve_format(self) -> bool:
         """Whether to preserve original format"""
-        forwarding = self.config_data.get("forwarding", {})
-        return forwarding.get("preserve_format", True)
+        return self._forwarding.get("preserve_format", True)
     
     @property
     def add_source_info(self) -> bool:
         """Whether to add source information"""
-        forwarding = self.config_data.get("forwarding", {})
-        return forwarding.get("add_source_info", True)
+        return self._forwarding.get("add_source_info", True)
     
     @property
     def forward_delay(self) -> float:
         """Forwarding delay (seconds)"""
-        forwarding = self.config_data.get("forwarding", {})
-        return float(forwarding.get("delay", 0.5))
+        return float(self._forwarding.get("delay", 0.5))
+
+    # Send rate limit configuration (shared by all rules, 0 = unlimited)
+    @property
+    def rate_limit_per_chat(self) -> float:
+        """Messages per minute sent to one target chat"""
+        return max(0.0, float(self._rate_limit.get("per_chat_per_minute") or 0))
+
+    @property
+    def rate_limit_global(self) -> float:
+        """Messages per second sent across all target chats"""
+        return max(0.0, float(self._rate_limit.get("global_per_second") or 0))
     
     def get_forwarding_rules(self) -> List[ForwardingRule]:
         """Get forwarding rules list"""
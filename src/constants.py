@@ -4,11 +4,18 @@
 BOT_STOP_TIMEOUT = 10          # Bot stop timeout (seconds)
 BOT_RESTART_DELAY = 2          # Bot restart delay (seconds)
 BOT_MAIN_LOOP_INTERVAL = 1     # Bot main loop interval (seconds)
+ENTITY_NAME_CACHE_SIZE = 512   # Chat/sender display names cached for logs
+ENTITY_NAME_CACHE_TTL = 300    # Cached display name lifetime (seconds)
+
+# Client constants
+DIALOG_WARMUP_LIMIT = 100      # Dialogs prefetched after login to warm entity cache
 
 # Forwarder constants
 ENTITY_FETCH_TIMEOUT = 5       # Entity info fetch timeout (seconds)
 MESSAGE_PREVIEW_LENGTH = 50    # Message preview length
 FORWARD_PREVIEW_LENGTH = 30    # Forward preview length
+FORWARD_TARGET_CONCURRENCY = 4  # Max concurrent sends to targets per forwarder
+RATE_LIMIT_LOG_DELAY = 1.0     # Log sends held back by the rate limiter at least this long (seconds)
 
 # WebUI constants
 UI_REFRESH_INTERVAL = 2.0      # UI refresh interval (seconds)
@@ -2,8 +2,9 @@
 Message filtering module
 Supports regex, keyword matching, media type and file size filtering
 """
+import logging
 import re
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Tuple, Union
 from telethon.tl.types import (
     Message,
     MessageMediaPhoto, MessageMediaDocument, MessageMediaWebPage,
@@ -13,70 +14,154 @@ from telethon.tl.types import (
 from src.logger import get_logger
 from src.i18n import t
 
+try:
+    import ahocorasick
+except ImportError:  # Optional: keyword matching falls back to a regex alternation
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:  # Optional: linear-time regex engine (google-re2), enabled per rule with use_re2
+    re2 = None
+
 logger = get_logger()
 
 # Supported media types
 MEDIA_TYPES = ["text", "photo", "video", "document", "audio", "voice", "sticker", "animation", "webpage"]
 
 
+# Attribute used to cache inspect_media() results on a message
+_MEDIA_INFO_ATTR = "_telerelay_media_info"
+
+# Exact TL type -> media type, one dict lookup instead of an isinstance chain
+_ATTR_TO_TYPE = {
+    DocumentAttributeSticker: "sticker",
+    DocumentAttributeAnimated: "animation",
+    # Both regular videos and round video messages count as video
+    DocumentAttributeVideo: "video",
+    DocumentAttributeAudio: "audio",
+}
+_MEDIA_TO_TYPE = {
+    MessageMediaPhoto: "photo",
+    MessageMediaWebPage: "webpage",
+    MessageMediaDocument: "document",
+}
+
+# Up to this many keywords are matched with plain substring search,
+# which beats building a regex/automaton scan for short lists
+_SUBSTRING_KEYWORD_LIMIT = 4
+
+# Debug log keys whose templates each filter resolves once
+_DEBUG_LOG_KEYS = (
+    "log.filter.media_type_filtered",
+    "log.filter.file_too_small",
+    "log.filter.file_too_large",
+    "log.filter.regex_matched",
+    "log.filter.keyword_matched",
+    "log.filter.user_ignored",
+    "log.filter.keyword_ignored",
+)
+
+
+def _compile_regex(pattern: str, use_re2: bool = False):
+    """
+    Compile a user-supplied pattern
+
+    With use_re2 the pattern is compiled by RE2, which matches in linear time
+    so a pathological pattern cannot stall the event loop. Note that RE2's
+    \\w, \\d and \\b are ASCII-only (e.g. \\w does not match CJK text).
+    Syntax RE2 does not support (backreferences, lookaround) falls back to
+    the standard re module with a warning.
+
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    if use_re2 and re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception as e:
+            logger.warning(t("log.filter.re2_fallback", pattern=pattern, error=str(e)))
+    return re.compile(pattern)
+
+
+def _document_type(doc) -> str:
+    """Determine media type based on document attributes"""
+    for attr in doc.attributes:
+        media_type = _ATTR_TO_TYPE.get(type(attr))
+        if media_type:
+            if media_type == "audio" and getattr(attr, 'voice', False):
+                return "voice"
+            return media_type
+    return "document"
+
+
+def _photo_size(photo) -> int:
+    """Get the largest size of a photo in bytes"""
+    sizes = photo.sizes if photo else None
+    if sizes:
+        # The largest size is normally last and carries the byte size
+        size = getattr(sizes[-1], 'size', None)
+        if size is not None:
+            return size
+        return max((getattr(size, 'size', 0) for size in sizes), default=0)
+    return 0
+
+
+def inspect_media(message: Message) -> Tuple[str, int]:
+    """
+    Get the media type and file size of a message in a single pass
+
+    The result is cached on the message object, so several rules
+    filtering the same message only inspect its media once.
+
+    Returns:
+        (media type, file size in bytes or 0 if no file)
+    """
+    info = getattr(message, _MEDIA_INFO_ATTR, None)
+    if info is not None:
+        return info
+
+    media = message.media
+    kind = _MEDIA_TO_TYPE.get(type(media)) if media else None
+    if kind == "photo":
+        info = ("photo", _photo_size(media.photo))
+    elif kind == "webpage":
+        info = ("webpage", 0)
+    elif kind == "document" and media.document:
+        doc = media.document
+        info = (_document_type(doc), doc.size or 0)
+    else:
+        info = ("text", 0)
+
+    try:
+        setattr(message, _MEDIA_INFO_ATTR, info)
+    except AttributeError:
+        pass
+    return info
+
+
 def get_media_type(message: Message) -> str:
     """Get the media type of a message"""
-    if not message.media:
-        return "text"
-    
-    if isinstance(message.media, MessageMediaPhoto):
-        return "photo"
-    
-    if isinstance(message.media, MessageMediaWebPage):
-        return "webpage"
-    
-    if isinstance(message.media, MessageMediaDocument):
-        doc = message.media.document
-        if doc:
-            # Determine type based on document attributes
-            for attr in doc.attributes:
-                if isinstance(attr, DocumentAttributeSticker):
-                    return "sticker"
-                if isinstance(attr, DocumentAttributeAnimated):
-                    return "animation"
-                if isinstance(attr, DocumentAttributeVideo):
-                    # Distinguish between video and GIF animation
-                    if getattr(attr, 'round_message', False):
-                        return "video"  # Video message
-                    return "video"
-                if isinstance(attr, DocumentAttributeAudio):
-                    if getattr(attr, 'voice', False):
-                        return "voice"
-                    return "audio"
-            return "document"
-    
-    return "text"
+    return inspect_media(message)[0]
 
 
 def get_file_size(message: Message) -> int:
     """Get the file size in bytes from a message, returns 0 if no file"""
-    if not message.media:
-        return 0
-    
-    if isinstance(message.media, MessageMediaDocument):
-        doc = message.media.document
-        if doc:
-            return doc.size or 0
-    
-    if isinstance(message.media, MessageMediaPhoto):
-        # Get the largest size for photos
-        photo = message.media.photo
-        if photo and photo.sizes:
-            for size in reversed(photo.sizes):
-                if hasattr(size, 'size'):
-                    return size.size
-    
-    return 0
+    return inspect_media(message)[1]
 
 
 class MessageFilter:
     """Message filter"""
-    
+
+    # Fixed attribute set: slot access is faster than instance __dict__ lookups on the hot path
+    __slots__ = (
+        "rule_name", "_log_prefix", "regex_patterns", "keywords", "mode",
+        "ignored_user_ids", "ignored_keywords", "media_types", "max_file_size", "min_file_size",
+        "_is_whitelist", "_has_size_limits", "compiled_patterns", "_combined_re", "_separate_patterns",
+        "_keyword_finder", "_ignored_keyword_finder", "_no_text_rules", "_no_ignore", "_no_media_rules",
+        "_constant_result", "_debug_templates", "_decide", "use_re2",
+    )
+
     def __init__(
         self,
         rule_name: str = "",
@@ -89,6 +174,7 @@ class MessageFilter:
         media_types: List[str] = None,
         max_file_size: int = 0,
         min_file_size: int = 0,
+        use_re2: bool = False,
     ):
         """
         Initialize filter
@@ -102,104 +188,279 @@ class MessageFilter:
             media_types: List of allowed media types (empty list = allow all)
             max_file_size: Maximum file size in bytes, 0 = no limit
             min_file_size: Minimum file size in bytes
+            use_re2: Compile regex patterns with RE2 (google-re2) when installed
         """
         self.rule_name = rule_name
         self._log_prefix = f"[{rule_name}] " if rule_name else ""
+        # Raw debug templates, formatted per message only when DEBUG is enabled
+        self._debug_templates = {key: t(key) for key in _DEBUG_LOG_KEYS}
         self.regex_patterns = regex_patterns or []
         self.keywords = keywords or []
         self.mode = mode.lower()
-        self.ignored_user_ids = ignored_user_ids or []
+        self.ignored_user_ids = frozenset(ignored_user_ids or ())
         self.ignored_keywords = ignored_keywords or []
-        self.media_types = media_types or []
+        self.media_types = frozenset(media_types or ())
         self.max_file_size = max_file_size
         self.min_file_size = min_file_size
+        self.use_re2 = use_re2
+        if use_re2 and re2 is None and self.regex_patterns:
+            logger.warning(t("log.filter.re2_unavailable"))
+
+        # Precomputed flags so the hot path branches on booleans
+        self._is_whitelist = self.mode == "whitelist"
+        self._has_size_limits = self.max_file_size > 0 or self.min_file_size > 0
 
         # Compile regex patterns
         self.compiled_patterns = []
         for pattern in self.regex_patterns:
             try:
-                self.compiled_patterns.append(re.compile(pattern))
+                self.compiled_patterns.append(_compile_regex(pattern, use_re2))
             except re.error as e:
                 logger.error(t("log.filter.regex_invalid", pattern=pattern, error=str(e)))
 
+        # Merge patterns into one alternation so a message needs a single search
+        self._combined_re, self._separate_patterns = self._combine_patterns(self.compiled_patterns, use_re2)
+
+        # Compile keywords into a single matcher (run against lowercased text)
+        self._keyword_finder = self._compile_keywords(self.keywords)
+        self._ignored_keyword_finder = self._compile_keywords(self.ignored_keywords)
+
+        # No rule can affect the result: should_forward returns a constant
+        self._no_text_rules = not self.compiled_patterns and not self.keywords
+        self._no_ignore = not self.ignored_user_ids and not self.ignored_keywords
+        self._no_media_rules = not self.media_types and not self._has_size_limits
+        self._constant_result = (
+            not self._is_whitelist
+            if self._no_text_rules and self._no_ignore and self._no_media_rules
+            else None
+        )
+        # should_forward's decision function with configuration branches resolved once
+        self._decide = self._build_decide()
+
         logger.info(
             t("log.filter.initialized",
               mode=self.mode,
               regex_count=len(self.compiled_patterns),
               keyword_count=len(self.keywords),
-              media_types=self.media_types or t("misc.all_media_types"),
+              media_types=sorted(self.media_types) or t("misc.all_media_types"),
               min_size=self.min_file_size,
               max_size=self.max_file_size or t("misc.unlimited"))
         )
     
+    def _log_debug(self, key: str, **kwargs) -> None:
+        """Log a translated debug message, skipping translation when DEBUG is disabled"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{self._log_prefix}{self._debug_templates[key].format(**kwargs)}")
+
+    @staticmethod
+    def _combine_patterns(patterns: list, use_re2: bool = False) -> tuple:
+        """
+        Merge compiled patterns into a single alternation
+
+        Patterns with capture groups are kept separate, since merging would
+        renumber their backreferences. With use_re2 only RE2-compiled patterns
+        are merged, and only into an RE2 alternation, so one pattern that
+        needed the re fallback does not drag the others out of RE2.
+
+        Returns:
+            (combined pattern or None, patterns still searched one by one)
+        """
+        engine_re2 = use_re2 and re2 is not None
+        mergeable = [p for p in patterns if not p.groups and not (engine_re2 and isinstance(p, re.Pattern))]
+        if len(mergeable) < 2:
+            return None, patterns
+
+        source = "|".join(f"(?:{p.pattern})" for p in mergeable)
+        try:
+            combined = re2.compile(source) if engine_re2 else re.compile(source)
+        except Exception:
+            # e.g. inline global flags, which are only valid at the start of a pattern
+            return None, patterns
+
+        merged = set(map(id, mergeable))
+        return combined, [p for p in patterns if id(p) not in merged]
+
+    @staticmethod
+    def _compile_keywords(keywords: List[str]) -> Optional[Callable[[str], Optional[str]]]:
+        """
+        Compile keywords into a single-pass matcher
+
+        A few keywords are checked with str containment; longer lists use an
+        Aho-Corasick automaton when pyahocorasick is installed, otherwise
+        one regex alternation.
+
+        Returns:
+            Function returning the first keyword found in lowercased text
+            (None if no match), or None if no keywords
+        """
+        # Lowercase once and drop duplicates, keeping order
+        lowered = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        if not lowered:
+            return None
+        if "" in lowered:
+            # An empty keyword is contained in any text, as with a plain `in` check
+            return lambda text_lower: ""
+
+        if len(lowered) <= _SUBSTRING_KEYWORD_LIMIT:
+            lowered = tuple(lowered)
+
+            def find(text_lower: str) -> Optional[str]:
+                for keyword in lowered:
+                    if keyword in text_lower:
+                        return keyword
+                return None
+        elif ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword in lowered:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+
+            def find(text_lower: str) -> Optional[str]:
+                for _, keyword in automaton.iter(text_lower):
+                    return keyword
+                return None
+        else:
+            pattern = re.compile("|".join(re.escape(keyword) for keyword in lowered))
+
+            def find(text_lower: str) -> Optional[str]:
+                match = pattern.search(text_lower)
+                return match.group(0) if match else None
+
+        return find
+
+    def _build_decide(self) -> Callable[[str, Optional[int], Optional[Message]], bool]:
+        """
+        Build the decision function used by should_forward
+
+        Checks that can never fail for this configuration are left out,
+        and the rest are bound as closure variables, so each message only
+        runs the branches its rule actually needs.
+        """
+        is_whitelist = self._is_whitelist
+        check_sender = self._is_ignored_sender if self.ignored_user_ids else None
+        check_type = self._media_type_allowed if self.media_types else None
+        check_size = self._file_size_allowed if self._has_size_limits else None
+        check_ignored_text = self._is_ignored_text if self._ignored_keyword_finder else None
+        match_text = None if self._no_text_rules else self.matches_text
+        needs_lower = bool(self._keyword_finder or self._ignored_keyword_finder)
+
+        def decide(text: str, sender_id: Optional[int], msg_obj: Optional[Message]) -> bool:
+            # Cheapest and most selective checks first
+            # 1. Ignored users
+            if check_sender and check_sender(sender_id):
+                return False
+
+            # 2. Check media type and file size (only when Message object is passed)
+            if msg_obj is not None and (check_type or check_size):
+                media_type, file_size = inspect_media(msg_obj)
+                if check_type and not check_type(media_type):
+                    return False
+                if check_size and not check_size(file_size):
+                    return False
+
+            # Lowercase once, shared by ignored-keyword and keyword matching
+            text_lower = text.lower() if needs_lower and text else None
+
+            # 3. Ignored keywords
+            if check_ignored_text and check_ignored_text(text, text_lower):
+                return False
+
+            # 4. Text matching rules
+            # If no rules configured, whitelist mode - don't forward, blacklist mode - forward
+            if match_text is None:
+                return not is_whitelist
+
+            # Whitelist: forward only if matched; blacklist: forward only if not matched
+            return match_text(text, text_lower) == is_whitelist
+
+        return decide
+
     def check_media_type(self, message: Message) -> bool:
         """Check if media type is allowed. Returns True if allowed"""
         if not self.media_types:
             return True  # Empty list = allow all
+        return self._media_type_allowed(get_media_type(message))
 
-        media_type = get_media_type(message)
+    def _media_type_allowed(self, media_type: str) -> bool:
+        """Check an already inspected media type against the allowed set"""
         allowed = media_type in self.media_types
         if not allowed:
-            logger.debug(f"{self._log_prefix}{t('log.filter.media_type_filtered', type=media_type, allowed=self.media_types)}")
+            self._log_debug("log.filter.media_type_filtered", type=media_type, allowed=sorted(self.media_types))
         return allowed
     
     def check_file_size(self, message: Message) -> bool:
         """Check if file size is within limits. Returns True if allowed"""
-        file_size = get_file_size(message)
+        return self._file_size_allowed(get_file_size(message))
 
+    def _file_size_allowed(self, file_size: int) -> bool:
+        """Check an already inspected file size against the size limits"""
         # No file = skip size check
         if file_size == 0:
             return True
 
         # Check minimum size
         if self.min_file_size > 0 and file_size < self.min_file_size:
-            logger.debug(f"{self._log_prefix}{t('log.filter.file_too_small', size=file_size, min_size=self.min_file_size)}")
+            self._log_debug("log.filter.file_too_small", size=file_size, min_size=self.min_file_size)
             return False
 
         # Check maximum size
         if self.max_file_size > 0 and file_size > self.max_file_size:
-            logger.debug(f"{self._log_prefix}{t('log.filter.file_too_large', size=file_size, max_size=self.max_file_size)}")
+            self._log_debug("log.filter.file_too_large", size=file_size, max_size=self.max_file_size)
             return False
 
         return True
     
-    def matches_text(self, text: str) -> bool:
-        """Check if text matches regex or keywords"""
+    def matches_text(self, text: str, text_lower: str = None) -> bool:
+        """Check if text matches regex or keywords (text_lower: precomputed text.lower())"""
         if not text:
             return False
 
         # Check regex
-        for pattern in self.compiled_patterns:
+        if self._combined_re and self._combined_re.search(text):
+            if logger.isEnabledFor(logging.DEBUG):
+                # Find which pattern matched only for the debug log
+                pattern = next(p for p in self.compiled_patterns if p.search(text))
+                self._log_debug("log.filter.regex_matched", pattern=pattern.pattern)
+            return True
+
+        for pattern in self._separate_patterns:
             if pattern.search(text):
-                logger.debug(f"{self._log_prefix}{t('log.filter.regex_matched', pattern=pattern.pattern)}")
+                self._log_debug("log.filter.regex_matched", pattern=pattern.pattern)
                 return True
 
         # Check keywords
-        text_lower = text.lower()
-        for keyword in self.keywords:
-            if keyword.lower() in text_lower:
-                logger.debug(f"{self._log_prefix}{t('log.filter.keyword_matched', keyword=keyword)}")
+        if self._keyword_finder:
+            if text_lower is None:
+                text_lower = text.lower()
+            keyword = self._keyword_finder(text_lower)
+            if keyword is not None:
+                self._log_debug("log.filter.keyword_matched", keyword=keyword)
                 return True
 
         return False
     
-    def is_ignored(self, text: str, sender_id: int = None) -> bool:
-        """Check if should be ignored (highest priority)"""
-        # Check user blacklist
+    def is_ignored(self, text: str, sender_id: int = None, text_lower: str = None) -> bool:
+        """Check if should be ignored (highest priority; text_lower: precomputed text.lower())"""
+        return self._is_ignored_sender(sender_id) or self._is_ignored_text(text, text_lower)
+
+    def _is_ignored_sender(self, sender_id: Optional[int]) -> bool:
+        """Check user blacklist"""
         if sender_id and sender_id in self.ignored_user_ids:
-            logger.debug(f"{self._log_prefix}{t('log.filter.user_ignored', user_id=sender_id)}")
+            self._log_debug("log.filter.user_ignored", user_id=sender_id)
             return True
+        return False
 
-        # Check ignored keywords
-        if text:
-            text_lower = text.lower()
-            for keyword in self.ignored_keywords:
-                if keyword.lower() in text_lower:
-                    logger.debug(f"{self._log_prefix}{t('log.filter.keyword_ignored', keyword=keyword)}")
-                    return True
-
+    def _is_ignored_text(self, text: str, text_lower: str = None) -> bool:
+        """Check ignored keywords"""
+        if text and self._ignored_keyword_finder:
+            if text_lower is None:
+                text_lower = text.lower()
+            keyword = self._ignored_keyword_finder(text_lower)
+            if keyword is not None:
+                self._log_debug("log.filter.keyword_ignored", keyword=keyword)
+                return True
         return False
-    
+
     def should_forward(self, message: Union[Message, str], sender_id: int = None) -> bool:
         """
         Determine if message should be forwarded
@@ -211,6 +472,9 @@ class MessageFilter:
         Returns:
             Whether to forward
         """
+        if self._constant_result is not None:
+            return self._constant_result
+
         # Compatibility: support passing string (old calling method)
         if isinstance(message, str):
             text = message
@@ -219,26 +483,4 @@ class MessageFilter:
             text = message.text or ""
             msg_obj = message
 
-        # 1. Check ignore list first
-        if self.is_ignored(text, sender_id):
-            return False
-
-        # 2. Check media type (only when Message object is passed)
-        if msg_obj and not self.check_media_type(msg_obj):
-            return False
-
-        # 3. Check file size
-        if msg_obj and not self.check_file_size(msg_obj):
-            return False
-
-        # 4. Text matching rules
-        # If no rules configured, whitelist mode - don't forward, blacklist mode - forward
-        if not self.compiled_patterns and not self.keywords:
-            return self.mode == "blacklist"
-
-        matches = self.matches_text(text)
-
-        if self.mode == "whitelist":
-            return matches  # Whitelist: forward only if matched
-        else:
-            return not matches  # Blacklist: forward only if not matched
+        return self._decide(text, sender_id, msg_obj)
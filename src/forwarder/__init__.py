@@ -2,5 +2,7 @@
 Message forwarding module
 """
 from .forwarder import MessageForwarder
+from .media_group import MediaGroupCollector
+from .rate_limiter import RateLimiter
 
-__all__ = ['MessageForwarder']
+__all__ = ['MessageForwarder', 'MediaGroupCollector', 'RateLimiter']
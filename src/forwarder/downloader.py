@@ -1,11 +1,16 @@
 """
 Media download module
 """
+import asyncio
+import io
+import logging
 import os
 import tempfile
-from typing import List, Optional
+import threading
+from typing import List, NamedTuple, Optional, Union
 from telethon import TelegramClient
 from telethon.tl.types import Message
+from src.filters import get_file_size
 from src.logger import get_logger
 from src.i18n import t
 
@@ -13,67 +18,185 @@ logger = get_logger()
 
 # Temporary file directory
 TEMP_DIR = os.path.join(tempfile.gettempdir(), "telerelay-cache")
+# Concurrent downloads when no semaphore is shared by the forwarder
+DEFAULT_MAX_PARALLEL_IO = 4
+# Media up to this size (bytes) is kept in memory instead of a temporary file
+IN_MEMORY_MAX_SIZE = 50 * 1024 * 1024
+# Total bytes of media held in memory at once across all rules, the rest goes to disk
+IN_MEMORY_TOTAL_MAX_SIZE = 100 * 1024 * 1024
+
+
+class _MemoryBudget:
+    """Process-wide byte budget for in-memory downloads"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, size: int) -> bool:
+        """Reserve size bytes, returns False if it would exceed the limit"""
+        with self._lock:
+            if self.used + size > self.limit:
+                return False
+            self.used += size
+            return True
+
+    def release(self, size: int) -> None:
+        """Return size bytes to the budget"""
+        with self._lock:
+            self.used = max(0, self.used - size)
+
+
+_memory_budget = _MemoryBudget(IN_MEMORY_TOTAL_MAX_SIZE)
+
+
+class InMemoryFile(NamedTuple):
+    """Downloaded media kept in memory"""
+    name: str
+    data: bytes
+
+    def open(self) -> io.BytesIO:
+        """Open a new stream for one upload (streams are not shared between concurrent sends)"""
+        stream = io.BytesIO(self.data)
+        stream.name = self.name  # Telethon uses the name for file name and MIME type
+        return stream
+
+
+# Downloaded media: temporary file path or in-memory file
+DownloadedFile = Union[str, InMemoryFile]
+
+
+def _file_name(file: DownloadedFile) -> str:
+    """Get the display name of a downloaded file"""
+    return file.name if isinstance(file, InMemoryFile) else os.path.basename(file)
+
+
+def _remove_temp_file(path: str) -> None:
+    """Remove a temporary file, ignoring files that are already gone"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        logger.warning(t("log.forward.downloader.cleanup_failed", path=path, error=e))
+        return
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(t("log.forward.downloader.cleanup", path=path))
 
 
 class MediaDownloader:
     """Handle media file download and cleanup"""
 
-    def __init__(self, client: TelegramClient, rule_name: str):
+    def __init__(self, client: TelegramClient, rule_name: str, io_semaphore: Optional[asyncio.Semaphore] = None):
+        """
+        Args:
+            client: Telegram client
+            rule_name: Rule name
+            io_semaphore: Limits concurrent downloads (shared with uploads), DEFAULT_MAX_PARALLEL_IO if None
+        """
         self.client = client
         self.rule_name = rule_name
-
-    async def download(self, messages: List[Message]) -> List[str]:
-        """Download media files from messages, return list of file paths"""
+        self.io_semaphore = io_semaphore or asyncio.Semaphore(DEFAULT_MAX_PARALLEL_IO)
+        # Created once per downloader (i.e. per bot start), not on every download
         os.makedirs(TEMP_DIR, exist_ok=True)
-        file_paths = []
+
+    async def download(self, messages: List[Message]) -> List[DownloadedFile]:
+        """Download media files from messages, return list of downloaded files"""
+        files = []
 
         if len(messages) == 1:
-            path = await self._download_single(messages[0])
-            if path:
-                file_paths.append(path)
+            file = await self._download_single(messages[0])
+            if file:
+                files.append(file)
         else:
-            file_paths = await self._download_group(messages)
-
-        return file_paths
-
-    async def _download_single(self, message: Message) -> Optional[str]:
+            files = await self._download_group(messages)
+
+        return files
+
+    async def _fetch(self, message: Message) -> Optional[DownloadedFile]:
+        """Download media into memory when small enough and within budget, otherwise into TEMP_DIR"""
+        size = get_file_size(message)
+        in_memory = 0 < size <= IN_MEMORY_MAX_SIZE and _memory_budget.reserve(size)
+        async with self.io_semaphore:
+            if not in_memory:
+                return await self.client.download_media(message, file=TEMP_DIR)
+
+            try:
+                data = await self.client.download_media(message, file=bytes)
+            except BaseException:
+                _memory_budget.release(size)
+                raise
+            if not data:
+                _memory_budget.release(size)
+                return None
+            # Track the actual size, cleanup() releases len(data)
+            _memory_budget.release(size - len(data))
+            media_file = message.file
+            name = (media_file.name if media_file else None) or f"{message.id}{media_file.ext if media_file else ''}"
+            return InMemoryFile(name, data)
+
+    async def _download_single(self, message: Message) -> Optional[DownloadedFile]:
         """Download media from a single message"""
         if not message.media:
             return None
 
-        logger.info(t("log.forward.downloader.downloading"))
-        path = await self.client.download_media(message, file=TEMP_DIR)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(t("log.forward.downloader.downloading"))
+        file = await self._fetch(message)
+
+        if file and logger.isEnabledFor(logging.INFO):
+            # Size is known from the message metadata, stat() only when it was not reported
+            if isinstance(file, InMemoryFile):
+                size = len(file.data)
+            else:
+                size = get_file_size(message) or os.path.getsize(file)
+            logger.info(t("log.forward.downloader.complete", filename=_file_name(file), size=f"{size / 1048576:.1f}"))
+
+        return file
+
+    async def _download_group(self, messages: List[Message]) -> List[DownloadedFile]:
+        """Download all media from a media group concurrently, keeping message order"""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(t("log.forward.downloader.group_downloading", count=len(messages)))
+        total = len(messages)
+
+        results = await asyncio.gather(
+            *(self._download_group_item(msg, i, total) for i, msg in enumerate(messages) if msg.media),
+            return_exceptions=True,
+        )
+        files = [file for file in results if file and not isinstance(file, BaseException)]
+
+        if files and logger.isEnabledFor(logging.INFO):
+            logger.info(t("log.forward.downloader.group_complete", count=len(files)))
+
+        return files
+
+    async def _download_group_item(self, message: Message, index: int, total: int) -> Optional[DownloadedFile]:
+        """Download one media group item, logging per-file progress"""
+        try:
+            file = await self._fetch(message)
+        except Exception as e:
+            logger.warning(t("log.forward.downloader.group_item_failed", current=index + 1, total=total, error=e))
+            raise
+
+        if file and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(t("log.forward.downloader.group_progress", current=index + 1, total=total, filename=_file_name(file)))
+        return file
 
-        if path:
-            file_size_mb = os.path.getsize(path) / 1048576
-            logger.info(t("log.forward.downloader.complete", filename=os.path.basename(path), size=f"{file_size_mb:.1f}"))
-
-        return path
-
-    async def _download_group(self, messages: List[Message]) -> List[str]:
-        """Download all media from a media group"""
-        logger.info(t("log.forward.downloader.group_downloading", count=len(messages)))
-        file_paths = []
-
-        for i, msg in enumerate(messages):
-            if msg.media:
-                path = await self.client.download_media(msg, file=TEMP_DIR)
-                if path:
-                    file_paths.append(path)
-                    logger.debug(t("log.forward.downloader.group_progress", current=i+1, total=len(messages), filename=os.path.basename(path)))
-
-        if file_paths:
-            logger.info(t("log.forward.downloader.group_complete", count=len(file_paths)))
-
-        return file_paths
+    @staticmethod
+    def open_for_upload(files: List[DownloadedFile]) -> list:
+        """Convert downloaded files into send_file arguments (fresh streams for in-memory files)"""
+        return [file.open() if isinstance(file, InMemoryFile) else file for file in files]
 
     @staticmethod
-    def cleanup(file_paths: List[str]) -> None:
-        """Cleanup temporary files"""
-        for path in file_paths:
-            if path and os.path.exists(path):
-                try:
-                    os.remove(path)
-                    logger.debug(t("log.forward.downloader.cleanup", path=path))
-                except OSError as e:
-                    logger.warning(t("log.forward.downloader.cleanup_failed", path=path, error=e))
+    async def cleanup(files: List[DownloadedFile]) -> None:
+        """Cleanup temporary files in worker threads and release in-memory files from the budget"""
+        paths = []
+        for file in files:
+            if isinstance(file, InMemoryFile):
+                _memory_budget.release(len(file.data))
+            elif file:
+                paths.append(file)
+        if paths:
+            await asyncio.gather(*(asyncio.to_thread(_remove_temp_file, path) for path in paths))
@@ -3,31 +3,73 @@ Message forwarding core module
 """
 import asyncio
 import copy
-from typing import List
+import datetime
+import logging
+import random
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from telethon import TelegramClient
 from telethon.tl.types import Message, MessageEntityTextUrl, MessageEntityBlockquote, MessageMediaWebPage
 from telethon.errors import FloodWaitError, ChatForwardsRestrictedError
 from src.rule import ForwardingRule
 from src.filters import MessageFilter
 from src.logger import get_logger
-from src.utils import get_media_description
-from src.constants import FORWARD_PREVIEW_LENGTH
+from src.utils import get_message_preview
+from src.constants import FORWARD_PREVIEW_LENGTH, FORWARD_TARGET_CONCURRENCY, RATE_LIMIT_LOG_DELAY
 from src.i18n import t
 from .media_group import MediaGroupHandler
-from .downloader import MediaDownloader
+from .downloader import DownloadedFile, MediaDownloader
+from .rate_limiter import RateLimiter
 
 logger = get_logger()
 
+# FloodWait retry policy: give up after this many consecutive waits, add up to
+# 25% (capped) random jitter so forwarders sharing a client do not retry in lockstep
+FLOOD_WAIT_MAX_ATTEMPTS = 3
+FLOOD_WAIT_MAX_JITTER = 5.0
+
+# Upload chunk size (KB): Telegram's maximum part size, fewer upload requests per file
+UPLOAD_PART_SIZE_KB = 512
+
+
+# Marked chat IDs of channels/supergroups are -(CHANNEL_ID_OFFSET + channel_id)
+CHANNEL_ID_OFFSET = 1_000_000_000_000
+
+
+def _link_chat_id(chat_id: int) -> int:
+    """Get the ID used in t.me/c/ links (strips the -100 channel marker arithmetically)"""
+    return -chat_id - CHANNEL_ID_OFFSET if chat_id < -CHANNEL_ID_OFFSET else chat_id
+
+
+def _utf16_len(text: str) -> int:
+    """Length in UTF-16 code units (Telegram entity offsets)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+@lru_cache(maxsize=256)
+def _source_prefix(source_text: str) -> Tuple[str, int]:
+    """Build the source prefix and its UTF-16 length, shared by all targets of a message"""
+    prefix = f"{source_text}\n\n"
+    return prefix, _utf16_len(prefix)
+
 
 class MessageForwarder:
     """Message forwarder - core forwarding logic"""
 
+    __slots__ = (
+        "client", "rule", "filter", "bot_manager",
+        "forwarded_count", "filtered_count", "media_group", "downloader",
+        "_target_peers", "_send_semaphore", "_io_semaphore", "_noforwards_by_chat",
+        "_rate_limiter", "_source_templates",
+    )
+
     def __init__(
         self,
         client: TelegramClient,
         rule: ForwardingRule,
         message_filter: MessageFilter,
         bot_manager=None,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
         self.client = client
         self.rule = rule
@@ -38,44 +80,83 @@ class MessageForwarder:
         self.forwarded_count = 0
         self.filtered_count = 0
 
+        # Limits concurrent media downloads and uploads
+        self._io_semaphore = asyncio.Semaphore(rule.max_parallel_io)
+
         # Helper components
-        self.media_group = MediaGroupHandler(client, rule.name)
-        self.downloader = MediaDownloader(client, rule.name)
+        self.media_group = MediaGroupHandler(rule.name)
+        self.downloader = MediaDownloader(client, rule.name, self._io_semaphore)
+
+        # Resolved input peers of target chats: {configured target: InputPeer}
+        self._target_peers: Dict[Any, Any] = {}
+        # Caps concurrent target sends (shared across messages) to stay clear of FloodWait
+        self._send_semaphore = asyncio.Semaphore(FORWARD_TARGET_CONCURRENCY)
+        # Last observed noforwards flag per source chat: {chat_id: noforwards}
+        self._noforwards_by_chat: Dict[int, bool] = {}
+        # Send rate limits, shared with the other forwarders of the same client when given
+        self._rate_limiter = rate_limiter or RateLimiter()
+        # Source text templates with only {msg_id} left open: {(chat_id, username): template}
+        self._source_templates: Dict[Tuple[int, Optional[str]], str] = {}
+
+    async def handle_message(self, event, messages: Optional[List[Message]] = None) -> None:
+        """
+        Handle new message event (called by bot_manager central handler)
 
-    async def handle_message(self, event) -> None:
-        """Handle new message event (called by bot_manager central handler)"""
+        Args:
+            event: New message event
+            messages: Complete media group collected by the caller, None for a single message
+        """
         message: Message = event.message
 
-        # Debug serialized message
-        try:
-            if hasattr(message, 'to_dict'):
-                # Avoid overly large outputs via pretty print if possible, but keep it simple
-                logger.debug(f"[DEBUG] Intercepted message: {message.to_dict()}")
-        except Exception:
-            pass
-
+        # Debug serialized message (to_dict() walks the whole TL object, only when DEBUG is enabled)
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                if hasattr(message, 'to_dict'):
+                    # Avoid overly large outputs via pretty print if possible, but keep it simple
+                    logger.debug(f"[DEBUG] Intercepted message: {message.to_dict()}")
+            except Exception:
+                pass
+
+        # FloodWait is retried where it is raised (download, per-target send), never by
+        # re-entering forward_message: that would run media group dedup a second time
         try:
-            await self.forward_message(message, event.sender_id)
-
-            if self.rule.delay > 0:
-                await asyncio.sleep(self.rule.delay)
-
-        except FloodWaitError as e:
-            logger.warning(t("log.forward.flood_wait", seconds=e.seconds))
-            await asyncio.sleep(e.seconds)
-            await self.forward_message(message, event.sender_id)
+            await self.forward_message(message, event.sender_id, messages)
         except Exception as e:
             logger.error(t("log.forward.error", error=e), exc_info=True)
 
-    async def forward_message(self, message: Message, sender_id: int) -> None:
-        """Forward message to all targets"""
+    @staticmethod
+    def _flood_wait_delay(seconds: float) -> float:
+        """Server-requested wait plus random jitter"""
+        return seconds + random.uniform(0, min(seconds * 0.25, FLOOD_WAIT_MAX_JITTER))
+
+    async def _download_with_retry(self, messages: List[Message]) -> List[DownloadedFile]:
+        """Download media, waiting out FloodWait up to FLOOD_WAIT_MAX_ATTEMPTS times"""
+        for attempt in range(1, FLOOD_WAIT_MAX_ATTEMPTS + 1):
+            try:
+                return await self.downloader.download(messages)
+            except FloodWaitError as e:
+                if attempt == FLOOD_WAIT_MAX_ATTEMPTS:
+                    logger.error(t("log.forward.flood_wait_give_up", attempts=attempt))
+                    break
+                delay = self._flood_wait_delay(e.seconds)
+                self._rate_limiter.cooldown(delay)
+                logger.warning(t("log.forward.flood_wait", seconds=round(delay, 1)))
+                await asyncio.sleep(delay)
+        return []
+
+    async def forward_message(
+        self, message: Message, sender_id: int, messages: Optional[List[Message]] = None
+    ) -> None:
+        """Forward message (or the media group it belongs to, when given) to all targets"""
         targets = self.rule.target_chats
         if not targets:
             logger.error(t("log.forward.no_target"))
             return
 
-        # 1. Preprocessing: get messages, deduplicate, filter
-        messages = await self.media_group.get_messages(message)
+        # 1. Preprocessing: deduplicate, filter (media groups arrive already collected)
+        if messages is None:
+            messages = [message]
+
         is_media_group = len(messages) > 1
 
         if is_media_group and self.media_group.should_skip(message.grouped_id):
@@ -86,55 +167,106 @@ class MessageForwarder:
             return
 
         # 2. Prepare resources: check if download is needed
-        is_noforwards = getattr(message.chat, 'noforwards', False) if message.chat else False
+        is_noforwards = self._is_noforwards(message)
         need_download = is_noforwards and self.rule.force_forward
 
         downloaded_files = []
         if need_download:
-            downloaded_files = await self.downloader.download(messages)
+            downloaded_files = await self._download_with_retry(messages)
             if not downloaded_files:
                 logger.error(t("log.forward.download_failed"))
                 return
 
-        # 3. Execute forwarding: loop through all targets
+        # 3. Execute forwarding to all targets
         source_data = self._get_source_data(message) if self.rule.hide_sender else None
         source_text = self._build_source_text(message) if not self.rule.hide_sender else ""
-        success_count = 0
+        download_lock = asyncio.Lock()
+
+        async def ensure_downloaded() -> List[DownloadedFile]:
+            """Download once, shared by every target that needs files"""
+            nonlocal downloaded_files
+            async with download_lock:
+                if not downloaded_files:
+                    downloaded_files = await self.downloader.download(messages)
+            return downloaded_files
+
+        async def send_to_target(target) -> bool:
+            """Send to a single target, returns whether it succeeded"""
+            fallback = False  # Forwarding was refused, download and resend instead
+            flood_waits = 0
+            while flood_waits < FLOOD_WAIT_MAX_ATTEMPTS:
+                # Wait for send credit before taking a concurrency slot (one per send request)
+                waited = await self._rate_limiter.acquire(target)
+                if waited >= RATE_LIMIT_LOG_DELAY:
+                    logger.info(t("log.forward.rate_limited", target=target, seconds=round(waited, 1)))
+                async with self._send_semaphore:
+                    try:
+                        await self._resolve_target(target)
+                        if fallback:
+                            files = await ensure_downloaded()
+                            if not files:
+                                return False
+                            await self._send_files(files, messages, target, source_data, source_text)
+                        elif downloaded_files:
+                            await self._send_files(downloaded_files, messages, target, source_data, source_text)
+                        else:
+                            await self._forward_normal(messages, target, source_data, source_text, is_noforwards)
+                        return True
+
+                    except FloodWaitError as e:
+                        # FloodWait is account-wide: hold back every send of this client, then retry
+                        flood_waits += 1
+                        delay = self._flood_wait_delay(e.seconds)
+                        self._rate_limiter.cooldown(delay)
+                        logger.warning(t("log.forward.flood_wait", seconds=round(delay, 1)))
+                    except ChatForwardsRestrictedError as e:
+                        if fallback:
+                            logger.error(t("log.forward.fallback_failed", target=target, error=e))
+                            return False
+                        # Forwarding restricted: retry as download and resend, through the limiter again
+                        logger.warning(t("log.forward.restricted_fallback"))
+                        fallback = True
+                    except Exception as e:
+                        key = "log.forward.fallback_failed" if fallback else "log.forward.target_failed"
+                        logger.error(t(key, target=target, error=e))
+                        return False
+
+            logger.error(t("log.forward.flood_wait_give_up", attempts=FLOOD_WAIT_MAX_ATTEMPTS))
+            return False
 
-        for i, target in enumerate(targets):
-            try:
-                if downloaded_files:
-                    await self._send_files(downloaded_files, messages, target, source_data, source_text)
-                else:
-                    await self._forward_normal(messages, target, source_data, source_text, is_noforwards)
-
-                success_count += 1
-
-                # Delay between multiple targets
-                if self.rule.delay > 0 and i < len(targets) - 1:
-                    await asyncio.sleep(self.rule.delay)
-
-            except ChatForwardsRestrictedError:
-                # Forwarding restricted, fallback to download and resend
-                logger.warning(t("log.forward.restricted_fallback"))
-                try:
-                    if not downloaded_files:
-                        downloaded_files = await self.downloader.download(messages)
-                    if downloaded_files:
-                        await self._send_files(downloaded_files, messages, target, source_data, source_text)
-                        success_count += 1
-                except Exception as e2:
-                    logger.error(t("log.forward.fallback_failed", target=target, error=e2))
-            except Exception as e:
-                logger.error(t("log.forward.target_failed", target=target, error=e))
-
-        # 4. Cleanup resources
-        if downloaded_files:
-            MediaDownloader.cleanup(downloaded_files)
+        try:
+            if self.rule.delay > 0:
+                # Delay between multiple targets: send sequentially
+                results = []
+                for i, target in enumerate(targets):
+                    results.append(await send_to_target(target))
+                    if i < len(targets) - 1:
+                        await asyncio.sleep(self.rule.delay)
+            else:
+                # Targets are independent chats, send to all of them concurrently
+                results = await asyncio.gather(*(send_to_target(target) for target in targets))
+        finally:
+            # 4. Cleanup resources, also when cancelled mid-send (bot stop/restart): the
+            # in-memory budget is process-wide and would otherwise keep the bytes reserved
+            if downloaded_files:
+                await MediaDownloader.cleanup(downloaded_files)
+
+        success_count = sum(results)
 
         # 5. Statistics and logging
         self._log_result(message, messages, success_count, len(targets))
 
+    def _is_noforwards(self, message: Message) -> bool:
+        """Check whether the source chat restricts forwarding"""
+        chat = message.chat
+        if chat is None:
+            # Entity not available on this update, reuse the last observation if any
+            return self._noforwards_by_chat.get(message.chat_id, False)
+
+        noforwards = bool(getattr(chat, 'noforwards', False))
+        self._noforwards_by_chat[message.chat_id] = noforwards
+        return noforwards
+
     # ===== Forwarding strategies =====
 
     async def _forward_normal(
@@ -148,16 +280,15 @@ class MessageForwarder:
             await self._forward_copy(messages, target, None, source_text)
         elif self.rule.preserve_format:
             # Preserve format → direct forward
-            await self.client.forward_messages(target, messages)
-            logger.info(t("log.forward.direct_success", target=target))
+            await self.client.forward_messages(self._peer(target), messages)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(t("log.forward.direct_success", target=target))
         else:
             # Don't preserve format → copy with reference
             await self._forward_copy(messages, target, None, source_text)
 
     async def _forward_copy(self, messages: List[Message], target, source_data: dict, source_text: str) -> None:
         """Copy message by referencing media ID (without preserving 'forwarded from' label)"""
-        has_media = any(msg.media for msg in messages)
-        
         if len(messages) == 1:
             msg = messages[0]
             text = msg.raw_text or ""
@@ -173,7 +304,7 @@ class MessageForwarder:
             media = msg.media if not isinstance(msg.media, MessageMediaWebPage) else None
             
             await self.client.send_message(
-                target, text,
+                self._peer(target), text,
                 file=media,
                 formatting_entities=entities,
                 link_preview=False if source_data else None
@@ -193,16 +324,17 @@ class MessageForwarder:
             media_list = [msg.media for msg in messages if msg.media and not isinstance(msg.media, MessageMediaWebPage)]
             
             await self.client.send_file(
-                target,
+                self._peer(target),
                 file=media_list,
                 caption=text,
                 formatting_entities=entities,
             )
             
-        logger.info(t("log.forward.copy_success", target=target))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(t("log.forward.copy_success", target=target))
 
     async def _send_files(
-        self, file_paths: List[str], messages: List[Message], target, source_data: dict, source_text: str
+        self, file_paths: List[DownloadedFile], messages: List[Message], target, source_data: dict, source_text: str
     ) -> None:
         """Send to target using downloaded files"""
         if not file_paths:
@@ -217,18 +349,20 @@ class MessageForwarder:
                 text, entities = self._prepend_source(text, source_text, entities)
                 
             await self.client.send_message(
-                target, text,
+                self._peer(target), text,
                 formatting_entities=entities,
                 link_preview=False if source_data else None
             )
-            logger.info(t("log.forward.text_sent", target=target))
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(t("log.forward.text_sent", target=target))
             return
 
         first = messages[0]
         text = first.raw_text or ""
         entities = list(first.entities) if first.entities else []
 
-        file_passed = file_paths[0] if len(file_paths) == 1 else file_paths
+        upload_files = MediaDownloader.open_for_upload(file_paths)
+        file_passed = upload_files[0] if len(upload_files) == 1 else upload_files
         
         if source_data:
             text, added_entities = self._format_source_append(text, source_data)
@@ -236,18 +370,36 @@ class MessageForwarder:
         elif source_text:
             text, entities = self._prepend_source(text, source_text, entities)
 
-        logger.info(t("log.forward.uploading", target=target))
-        await self.client.send_file(
-            target,
-            file=file_passed,
-            caption=text,
-            formatting_entities=entities,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(t("log.forward.uploading", target=target))
+        async with self._io_semaphore:
+            await self.client.send_file(
+                self._peer(target),
+                file=file_passed,
+                caption=text,
+                formatting_entities=entities,
+                part_size_kb=UPLOAD_PART_SIZE_KB,
+            )
             
-        logger.info(t("log.forward.force_success", target=target))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(t("log.forward.force_success", target=target))
 
     # ===== Helper methods =====
 
+    async def _resolve_target(self, target) -> None:
+        """Resolve a target chat to its input peer once and cache it"""
+        if target in self._target_peers:
+            return
+        try:
+            self._target_peers[target] = await self.client.get_input_entity(target)
+        except Exception:
+            # Not cached: the send call uses the raw target and reports the real error
+            pass
+
+    def _peer(self, target):
+        """Get the cached input peer of a target, falls back to the target itself"""
+        return self._target_peers.get(target, target)
+
     def _get_source_data(self, message: Message) -> dict:
         """
         Build source information data (name, link)
@@ -258,7 +410,6 @@ class MessageForwarder:
         name = "Unknown"
         link = ""
         
-        import datetime
         # telethon message.date is usually a timezone-aware datetime in UTC
         if getattr(message, 'date', None):
             date_str = message.date.astimezone().strftime("%Y-%m-%d %H-%M-%S")
@@ -308,8 +459,7 @@ class MessageForwarder:
             # Private group/channel
             chat_id = getattr(target, 'id', None)
             if chat_id:
-                clean_id = str(chat_id).replace("-100", "", 1) if str(chat_id).startswith("-100") else str(chat_id)
-                link = f"https://t.me/c/{clean_id}/{msg_id}"
+                link = f"https://t.me/c/{_link_chat_id(chat_id)}/{msg_id}"
 
         return {"name": name, "link": link, "date": date_str}
 
@@ -325,31 +475,30 @@ class MessageForwarder:
         spacer = "\n" if text else ""
         
         # Use Blockquote for visual separation
-        source_label = f"{date_str}" if date_str else "Ref:"
-        append_str = f"{source_label} {name}"
+        source_label = f"{date_str} " if date_str else "Ref: "
         
-        base_offset = len((text + spacer).encode('utf-16-le')) // 2
-        append_length = len(append_str.encode('utf-16-le')) // 2
+        # Offsets are summed from the parts, no intermediate concatenations
+        base_offset = _utf16_len(text) + len(spacer)
+        label_length = _utf16_len(source_label)
+        name_length = _utf16_len(name)
         
         entities = [
             MessageEntityBlockquote(
                 offset=base_offset,
-                length=append_length
+                length=label_length + name_length
             )
         ]
         
         if link:
-            prefix_length = len(f"{source_label} ".encode('utf-16-le')) // 2
             entities.append(
                 MessageEntityTextUrl(
-                    offset=base_offset + prefix_length,
-                    length=len(name.encode('utf-16-le')) // 2,
+                    offset=base_offset + label_length,
+                    length=name_length,
                     url=link
                 )
             )
             
-        full_append = spacer + append_str
-        return text + full_append, entities
+        return "".join((text, spacer, source_label, name)), entities
 
 
 
@@ -361,24 +510,34 @@ class MessageForwarder:
             return ""
 
         chat = message.chat
-        msg_id = message.id
-
-        # Try to build clickable link
-        if chat:
-            username = getattr(chat, 'username', None)
-            if username:
-                # Public channel/group
-                return t("log.forward.source_label", username=username, msg_id=msg_id)
-            else:
-                # Private group: remove -100 prefix from chat_id
-                chat_id = message.chat_id
-                if chat_id and chat_id < 0:
-                    channel_id = str(chat_id).replace("-100", "")
-                    return t("log.forward.source_private", channel_id=channel_id, msg_id=msg_id)
+        if not chat:
+            # Entity not available on this update, not cached so a later message can build a link
+            return t("log.forward.source_unknown", chat_title=t("misc.unknown"))
+
+        # The chat part never changes for a source chat, only the message ID is filled per message.
+        # Username is part of the key so a renamed chat gets a new template.
+        username = getattr(chat, 'username', None)
+        key = (message.chat_id, username)
+        template = self._source_templates.get(key)
+        if template is None:
+            template = self._source_templates[key] = self._source_template(message.chat_id, chat, username)
+        return template.format(msg_id=message.id)
+
+    @staticmethod
+    def _source_template(chat_id: int, chat, username: Optional[str]) -> str:
+        """Build the source text template of a chat, leaving {msg_id} to be formatted"""
+        if username:
+            # Public channel/group
+            return t("log.forward.source_label", username=username, msg_id="{msg_id}")
 
-        # Fallback: unable to build link
+        if chat_id and chat_id < 0:
+            # Private group: remove -100 prefix from chat_id
+            channel_id = _link_chat_id(chat_id)
+            return t("log.forward.source_private", channel_id=channel_id, msg_id="{msg_id}")
+
+        # Fallback: unable to build link (braces escaped, the template is formatted again)
         chat_title = getattr(chat, 'title', None) or t("misc.unknown")
-        return t("log.forward.source_unknown", chat_title=chat_title)
+        return t("log.forward.source_unknown", chat_title=chat_title).replace("{", "{{").replace("}", "}}")
 
     def _prepend_source(self, text: str, source_text: str, entities: list = None) -> tuple[str, list]:
         """Prepend source information to message text, shifting entities offset"""
@@ -386,7 +545,7 @@ class MessageForwarder:
             return text, entities or []
 
         if text:
-            prefix = f"{source_text}\n\n"
+            prefix, prefix_len = _source_prefix(source_text)
             new_text = prefix + text
         else:
             return source_text, entities or []
@@ -394,7 +553,6 @@ class MessageForwarder:
         # Shift all existing entities by the prefix length (UTF-16 code units)
         shifted_entities = []
         if entities:
-            prefix_len = len(prefix.encode('utf-16-le')) // 2
             for ent in entities:
                 ent_copy = copy.copy(ent)
                 ent_copy.offset = ent.offset + prefix_len
@@ -404,11 +562,13 @@ class MessageForwarder:
 
     def _log_result(self, message: Message, messages: List[Message], success: int, total: int) -> None:
         """Log forwarding result"""
-        preview = (message.text or get_media_description(message))[:FORWARD_PREVIEW_LENGTH]
-        is_media_group = len(messages) > 1
-
         if success > 0:
             self.forwarded_count += 1
+            if not logger.isEnabledFor(logging.INFO):
+                return
+
+            preview = self._preview(message)
+            is_media_group = len(messages) > 1
             group_info = t("misc.media_group_info", count=len(messages)) if is_media_group else ""
             group_id_info = f" gid={message.grouped_id}" if is_media_group else ""
             logger.info(
@@ -420,7 +580,12 @@ class MessageForwarder:
                   total=total)
             )
         else:
-            logger.error(t("log.forward.all_failed", preview=preview))
+            logger.error(t("log.forward.all_failed", preview=self._preview(message)))
+
+    @staticmethod
+    def _preview(message: Message) -> str:
+        """Short message preview for logs (media description if no text)"""
+        return get_message_preview(message)[:FORWARD_PREVIEW_LENGTH]
 
     def get_stats(self) -> dict:
         """Get forwarding statistics"""
@@ -3,7 +3,9 @@ Media group handling module
 """
 import time
 import asyncio
-from typing import List
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional
 from telethon import TelegramClient
 from telethon.tl.types import Message
 from src.filters import MessageFilter
@@ -14,69 +16,157 @@ logger = get_logger()
 
 # Media group cache timeout (seconds)
 MEDIA_GROUP_CACHE_TTL = 3600
+# Maximum number of media groups remembered, bounds memory under bursts
+MEDIA_GROUP_CACHE_MAX_SIZE = 10000
+# Album collection ends once no new message arrived for this long (seconds)
+MEDIA_GROUP_QUIET_PERIOD = 0.3
+# Upper bound on collecting one album, counted from its first message (seconds)
+MEDIA_GROUP_COLLECT_TIMEOUT = 1.0
+# Maximum number of messages in a Telegram album
+MEDIA_GROUP_MAX_SIZE = 10
+
+
+class _PendingGroup:
+    """Album being collected: its messages and the signal that collection is done"""
+
+    __slots__ = ("messages", "done", "quiet_timer", "deadline_timer")
+
+    def __init__(self, message: Message):
+        loop = asyncio.get_running_loop()
+        self.messages: List[Message] = [message]
+        self.done = asyncio.Event()
+        self.quiet_timer = loop.call_later(MEDIA_GROUP_QUIET_PERIOD, self.done.set)
+        self.deadline_timer = loop.call_later(MEDIA_GROUP_COLLECT_TIMEOUT, self.done.set)
+
+    def add(self, message: Message) -> None:
+        """Add a late album message, finishing at once when the album is full"""
+        self.messages.append(message)
+        self.quiet_timer.cancel()
+        if len(self.messages) >= MEDIA_GROUP_MAX_SIZE:
+            self.done.set()
+        else:
+            self.quiet_timer = asyncio.get_running_loop().call_later(MEDIA_GROUP_QUIET_PERIOD, self.done.set)
+
+    def cancel_timers(self) -> None:
+        """Cancel pending timer callbacks"""
+        self.quiet_timer.cancel()
+        self.deadline_timer.cancel()
+
+
+class MediaGroupCollector:
+    """Collect album messages from their own events, shared by all rules of a client"""
+
+    def __init__(self, client: TelegramClient):
+        self.client = client
+        self._pending: Dict[int, _PendingGroup] = {}  # {grouped_id: album being collected}
 
+    async def get_messages(self, message: Message) -> Optional[List[Message]]:
+        """
+        Get all messages in a media group, return [message] for non-media-group
 
-class MediaGroupHandler:
-    """Handle media group retrieval, deduplication and filtering"""
-
-    def __init__(self, client: TelegramClient, rule_name: str):
-        self.client = client
-        self.rule_name = rule_name
-        self._processed_groups: dict = {}  # {grouped_id: timestamp}
+        Album messages arrive as separate events. The first one collects the
+        others as they arrive instead of re-reading chat history, until the
+        album is full, no message arrived for MEDIA_GROUP_QUIET_PERIOD, or
+        MEDIA_GROUP_COLLECT_TIMEOUT has passed.
 
-    async def get_messages(self, message: Message) -> List[Message]:
-        """Get all messages in a media group, return [message] for non-media-group"""
+        Returns:
+            Messages sorted by ID, or None if the message was merged into a
+            group another call is already collecting
+        """
         if not message.grouped_id:
             return [message]
 
-        try:
-            await asyncio.sleep(0.5)  # Wait for all messages in media group to arrive
+        grouped_id = message.grouped_id
+        pending = self._pending.get(grouped_id)
+        if pending is not None:
+            pending.add(message)
+            return None
 
+        pending = self._pending[grouped_id] = _PendingGroup(message)
+        try:
+            await pending.done.wait()
+        finally:
+            pending.cancel_timers()
+            del self._pending[grouped_id]
+        messages = pending.messages
+
+        # Only this message arrived in time: fall back to reading recent history
+        if len(messages) == 1:
+            messages = await self._fetch_from_history(message)
+
+        messages.sort(key=lambda m: m.id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(t("log.forward.media_group.collected", group_id=grouped_id, count=len(messages)))
+        return messages
+
+    async def _fetch_from_history(self, message: Message) -> List[Message]:
+        """Find media group messages in recent chat history, return [message] on failure"""
+        grouped_id = message.grouped_id
+        try:
+            # Album messages have consecutive IDs: fetch the window around this one in a single request
+            window = range(message.id - MEDIA_GROUP_MAX_SIZE + 1, message.id + MEDIA_GROUP_MAX_SIZE)
+            fetched = await self.client.get_messages(message.chat_id, ids=list(window))
+            messages = [msg for msg in fetched if msg and msg.grouped_id == grouped_id]
+            if len(messages) > 1:
+                return messages
+
+            # IDs not contiguous (e.g. interleaved service messages): scan recent history
             messages = []
             async for msg in self.client.iter_messages(message.chat_id, limit=50):
-                if msg.grouped_id == message.grouped_id:
+                if msg.grouped_id == grouped_id:
                     messages.append(msg)
-                if len(messages) >= 10:
+                if len(messages) >= MEDIA_GROUP_MAX_SIZE:
                     break
-
-            if not messages:
-                return [message]
-
-            messages.sort(key=lambda m: m.id)
-            logger.debug(t("log.forward.media_group.collected", group_id=message.grouped_id, count=len(messages)))
-            return messages
+            return messages or [message]
 
         except Exception as e:
             logger.warning(t("log.forward.media_group.fetch_failed", error=e))
             return [message]
 
+
+class MediaGroupHandler:
+    """Handle per-rule media group deduplication and filtering"""
+
+    def __init__(self, rule_name: str, max_size: int = MEDIA_GROUP_CACHE_MAX_SIZE):
+        self.rule_name = rule_name
+        self.max_size = max_size
+        self._processed_groups: OrderedDict = OrderedDict()  # {grouped_id: timestamp}, oldest first
+
     def should_skip(self, grouped_id) -> bool:
         """Check if media group has been processed (deduplication)"""
-        now = time.time()
+        now = time.monotonic()
+        groups = self._processed_groups
 
-        if grouped_id in self._processed_groups:
-            if now - self._processed_groups[grouped_id] < MEDIA_GROUP_CACHE_TTL:
+        # Cleanup expired cache: insertion order is time order, so only pop from the front
+        while groups and now - next(iter(groups.values())) >= MEDIA_GROUP_CACHE_TTL:
+            groups.popitem(last=False)
+
+        if grouped_id in groups:
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(t("log.forward.media_group.duplicate", group_id=grouped_id))
-                return True
-
-        # Record and cleanup expired cache
-        self._processed_groups[grouped_id] = now
-        self._processed_groups = {
-            gid: ts for gid, ts in self._processed_groups.items()
-            if now - ts < MEDIA_GROUP_CACHE_TTL
-        }
+            return True
+
+        groups[grouped_id] = now
+        # Evict oldest entries beyond the size limit
+        while len(groups) > self.max_size:
+            groups.popitem(last=False)
         return False
 
     def should_forward(self, messages: List[Message], message_filter: MessageFilter, sender_id: int) -> bool:
         """Determine if media group should be forwarded"""
-        has_text = any(msg.text for msg in messages)
+        # Only captioned items are filtered: a pure-media album passes without
+        # running the filter, a captioned one needs a matching caption
+        has_text = False
+        should_forward = message_filter.should_forward  # Bound once, not per item
+        for msg in messages:
+            if msg.text:
+                has_text = True
+                if should_forward(msg, sender_id=sender_id):
+                    return True
 
         if not has_text:
             return True  # All pure media, pass by default
 
-        # When there's text, check if any message matches filter conditions
-        if any(message_filter.should_forward(msg, sender_id=sender_id) for msg in messages):
-            return True
-
-        logger.debug(t("log.forward.media_group.filtered", group_id=messages[0].grouped_id))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(t("log.forward.media_group.filtered", group_id=messages[0].grouped_id))
         return False
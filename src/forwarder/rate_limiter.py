@@ -0,0 +1,96 @@
+"""
+Send rate limiting module
+"""
+import asyncio
+import time
+from typing import Any, Dict
+
+
+class TokenBucket:
+    """Token bucket: refills `rate` tokens per second, holds at most `capacity` (rate <= 0 = unlimited)"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "cooldown_until")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.cooldown_until = 0.0  # monotonic time until which sends are paused (FloodWait)
+
+    def reserve(self, n: int = 1) -> float:
+        """
+        Take n tokens, going into debt if needed
+
+        Callers queue up in reservation order without a lock: each one waits
+        for the debt accumulated before it to be repaid.
+
+        Returns:
+            Seconds to wait before sending
+        """
+        now = time.monotonic()
+        if self.rate <= 0:
+            return max(0.0, self.cooldown_until - now)
+
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= n
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.cooldown_until - now)
+
+
+class RateLimiter:
+    """
+    Per-chat and global send limits, shared by all forwarders of one client
+
+    Limits are off (0) unless configured; FloodWait cooldowns always apply.
+    A cooldown acts as a shared barrier: every pending and new acquire()
+    waits it out instead of each sender hitting FloodWait on its own.
+    """
+
+    def __init__(self, per_chat_per_minute: float = 0, global_per_second: float = 0):
+        """
+        Args:
+            per_chat_per_minute: Sends per minute to one chat (bursts up to this many), 0 = unlimited
+            global_per_second: Sends per second across all chats (bursts up to this many), 0 = unlimited
+        """
+        self.chat_rate = per_chat_per_minute / 60
+        self.chat_capacity = max(1.0, per_chat_per_minute)
+        self._global = TokenBucket(global_per_second, max(1.0, global_per_second))
+        self._chats: Dict[Any, TokenBucket] = {}  # {target chat: bucket}
+
+    def _bucket(self, chat) -> TokenBucket:
+        """Get the bucket of a chat, created on first use"""
+        bucket = self._chats.get(chat)
+        if bucket is None:
+            bucket = self._chats[chat] = TokenBucket(self.chat_rate, self.chat_capacity)
+        return bucket
+
+    async def acquire(self, chat) -> float:
+        """
+        Wait until one send request to chat is allowed
+
+        Returns:
+            Seconds waited
+        """
+        start = time.monotonic()
+        bucket = self._bucket(chat)
+        wait = max(self._global.reserve(), bucket.reserve())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        # A FloodWait may have been reported while this call was waiting
+        while (remaining := max(bucket.cooldown_until, self._global.cooldown_until) - time.monotonic()) > 0:
+            await asyncio.sleep(remaining)
+        return time.monotonic() - start
+
+    def cooldown(self, seconds: float, chat=None) -> None:
+        """
+        Pause sends for the given time (after a FloodWait)
+
+        Args:
+            seconds: Pause duration
+            chat: Only pause sends to this chat, None pauses every chat
+        """
+        bucket = self._global if chat is None else self._bucket(chat)
+        bucket.cooldown_until = max(bucket.cooldown_until, time.monotonic() + seconds)
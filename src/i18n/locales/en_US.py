@@ -28,7 +28,6 @@ TRANSLATIONS = {
             "error": "Bot error: {error}",
             "config_validation_failed": "Configuration validation failed: {error}",
             "connect_failed": "Unable to connect to Telegram",
-            "user_info_failed": "Failed to get user info: {error}",
             "rule_registered": "✓ Rule '{rule}' registered, monitoring {count} source(s)",
             "started": "✓ Bot started with {count} rule(s)",
             "stopped": "Bot stopped",
@@ -49,9 +48,12 @@ TRANSLATIONS = {
             "proxy_using": "Using proxy: {type} {host}:{port}",
             "proxy_parse_failed": "Failed to parse proxy configuration: {error}",
             "bot_token_required": "Bot mode requires BOT_TOKEN",
+            "auth_manager_required": "User mode requires AuthManager",
             "bot_connected": "Connected to Telegram using Bot Token",
             "session_detected": "Existing session detected, attempting auto-login...",
             "user_logged_in": "Logged in to Telegram - User: {name} (@{username})",
+            "user_cache_failed": "Failed to cache user info: {error}",
+            "warm_cache_failed": "Failed to prefetch dialogs: {error}",
             "phone_invalid": "Invalid phone number format",
             "code_invalid": "Invalid verification code",
             "password_invalid": "Invalid two-step verification password",
@@ -71,6 +73,8 @@ TRANSLATIONS = {
         # log.forward.* - forwarder related logs
         "forward": {
             "flood_wait": "Rate limit triggered, retrying after {seconds} seconds",
+            "flood_wait_give_up": "Rate limit persisted after {attempts} attempts, dropping message",
+            "rate_limited": "Send to {target} held back {seconds} seconds by rate limit",
             "error": "Failed to forward message: {error}",
             "no_target": "No target chat configured",
             "download_failed": "Force download failed, unable to forward",
@@ -95,6 +99,7 @@ TRANSLATIONS = {
                 "group_downloading": "⬇️ Starting media group download ({count} items)...",
                 "group_progress": "⬇️ Downloading {current}/{total}: {filename}",
                 "group_complete": "⬇️ Media group download complete: {count} file(s)",
+                "group_item_failed": "Failed to download media group item {current}/{total}: {error}",
                 "cleanup": "Temporary files cleaned up: {path}",
                 "cleanup_failed": "Failed to clean up temporary files: {path}, {error}",
             },
@@ -111,6 +116,8 @@ TRANSLATIONS = {
         # log.filter.* - filters.py logs
         "filter": {
             "regex_invalid": "Invalid regex pattern '{pattern}': {error}",
+            "re2_fallback": "Regex pattern '{pattern}' not supported by RE2, using re instead (no linear-time guarantee): {error}",
+            "re2_unavailable": "use_re2 is enabled but google-re2 is not installed, using re",
             "initialized": "Filter initialized - Mode: {mode}, Regex: {regex_count}, Keywords: {keyword_count}, Media types: {media_types}, File size: {min_size}-{max_size}",
             "media_type_filtered": "Media type filtered: {type} not in allowed list {allowed}",
             "file_too_small": "File too small, filtered: {size} < {min_size}",
@@ -151,7 +158,9 @@ TRANSLATIONS = {
             "env_not_found": "Environment file not found: {path}",
             "yaml_loaded": "YAML configuration file loaded: {path}",
             "yaml_not_found": "YAML configuration file not found: {path}",
+            "libyaml_unavailable": "libyaml not available, using pure Python YAML parser (install libyaml for faster loading)",
             "saved": "Configuration saved to: {path}",
+            "invalid_value": "Invalid {field} value '{value}' in rule '{rule}', using default {default}",
         },
 
         # log.admin_bot.* - admin bot logs
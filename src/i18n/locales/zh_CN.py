@@ -28,7 +28,6 @@ TRANSLATIONS = {
             "error": "Bot 运行出错: {error}",
             "config_validation_failed": "配置验证失败: {error}",
             "connect_failed": "无法连接到 Telegram",
-            "user_info_failed": "获取用户信息失败: {error}",
             "rule_registered": "✓ 规则 '{rule}' 已注册，监听 {count} 个源",
             "started": "✓ Bot 已启动，共 {count} 个规则",
             "stopped": "Bot 已停止",
@@ -49,9 +48,12 @@ TRANSLATIONS = {
             "proxy_using": "使用代理: {type} {host}:{port}",
             "proxy_parse_failed": "解析代理配置失败: {error}",
             "bot_token_required": "Bot 模式需要 BOT_TOKEN",
+            "auth_manager_required": "User 模式需要 AuthManager",
             "bot_connected": "已使用 Bot Token 连接到 Telegram",
             "session_detected": "检测到已有 session，尝试自动登录...",
             "user_logged_in": "已登录到 Telegram - 用户: {name} (@{username})",
+            "user_cache_failed": "缓存用户信息失败: {error}",
+            "warm_cache_failed": "预加载会话列表失败: {error}",
             "phone_invalid": "手机号格式无效",
             "code_invalid": "验证码错误",
             "password_invalid": "两步验证密码错误",
@@ -71,6 +73,8 @@ TRANSLATIONS = {
         # log.forward.* - forwarder 相关的日志
         "forward": {
             "flood_wait": "触发速率限制，等待 {seconds} 秒后重试",
+            "flood_wait_give_up": "连续 {attempts} 次触发速率限制，放弃该消息",
+            "rate_limited": "发送到 {target} 因速率限制延迟了 {seconds} 秒",
             "error": "转发消息失败: {error}",
             "no_target": "未配置目标聊天",
             "download_failed": "强制下载失败，无法转发",
@@ -95,6 +99,7 @@ TRANSLATIONS = {
                 "group_downloading": "⬇️ 开始下载媒体组 ({count} 项)...",
                 "group_progress": "⬇️ 下载 {current}/{total}: {filename}",
                 "group_complete": "⬇️ 媒体组下载完成: {count} 个文件",
+                "group_item_failed": "媒体组第 {current}/{total} 项下载失败: {error}",
                 "cleanup": "已清理临时文件: {path}",
                 "cleanup_failed": "清理临时文件失败: {path}, {error}",
             },
@@ -111,6 +116,8 @@ TRANSLATIONS = {
         # log.filter.* - filters.py 的日志
         "filter": {
             "regex_invalid": "无效的正则表达式 '{pattern}': {error}",
+            "re2_fallback": "RE2 不支持正则表达式 '{pattern}'，改用 re（不保证线性时间）: {error}",
+            "re2_unavailable": "已启用 use_re2 但未安装 google-re2，使用 re",
             "initialized": "过滤器初始化 - 模式: {mode}, 正则: {regex_count}, 关键词: {keyword_count}, 媒体类型: {media_types}, 文件大小: {min_size}-{max_size}",
             "media_type_filtered": "媒体类型被过滤: {type} 不在允许列表 {allowed}",
             "file_too_small": "文件太小被过滤: {size} < {min_size}",
@@ -151,7 +158,9 @@ TRANSLATIONS = {
             "env_not_found": "环境变量文件不存在: {path}",
             "yaml_loaded": "已加载 YAML 配置文件: {path}",
             "yaml_not_found": "YAML 配置文件不存在: {path}",
+            "libyaml_unavailable": "libyaml 不可用，使用纯 Python YAML 解析器（安装 libyaml 可加快加载）",
             "saved": "已保存配置到: {path}",
+            "invalid_value": "规则 '{rule}' 的 {field} 值 '{value}' 无效，使用默认值 {default}",
         },
 
         # log.admin_bot.* - admin bot logs
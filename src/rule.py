@@ -4,8 +4,26 @@ Defines data structure for multi-rule groups
 """
 from dataclasses import dataclass, field
 from typing import List, Dict, Any
+from src.logger import get_logger
 from src.i18n import t
 
+logger = get_logger()
+
+# Concurrent media downloads/uploads per rule when not configured
+DEFAULT_MAX_PARALLEL_IO = 4
+
+
+def _parse_max_parallel_io(value: Any, rule_name: str) -> int:
+    """Parse forwarding.max_parallel_io, warning and using the default on an invalid value"""
+    if not value:
+        return DEFAULT_MAX_PARALLEL_IO
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        logger.warning(t("log.config.invalid_value", rule=rule_name, field="forwarding.max_parallel_io",
+                         value=value, default=DEFAULT_MAX_PARALLEL_IO))
+        return DEFAULT_MAX_PARALLEL_IO
+
 
 @dataclass
 class ForwardingRule:
@@ -24,6 +42,7 @@ class ForwardingRule:
     filter_media_types: List[str] = field(default_factory=list)
     filter_max_file_size: int = 0
     filter_min_file_size: int = 0
+    filter_use_re2: bool = False  # Compile regex with RE2 (ASCII-only \w/\d/\b)
 
     # Ignore configuration
     ignored_user_ids: List[int] = field(default_factory=list)
@@ -35,6 +54,7 @@ class ForwardingRule:
     delay: float = 0.5
     force_forward: bool = False
     hide_sender: bool = False
+    max_parallel_io: int = DEFAULT_MAX_PARALLEL_IO  # Concurrent media downloads/uploads
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ForwardingRule':
@@ -42,9 +62,10 @@ class ForwardingRule:
         filters = data.get("filters", {})
         ignore = data.get("ignore", {})
         forwarding = data.get("forwarding", {})
-        
+        name = data.get("name", t("ui.status.default_rule"))
+
         return cls(
-            name=data.get("name", t("ui.status.default_rule")),
+            name=name,
             enabled=data.get("enabled", True),
             source_chats=data.get("source_chats", []),
             target_chats=data.get("target_chats", []),
@@ -54,6 +75,7 @@ class ForwardingRule:
             filter_media_types=filters.get("media_types", []),
             filter_max_file_size=filters.get("max_file_size", 0),
             filter_min_file_size=filters.get("min_file_size", 0),
+            filter_use_re2=bool(filters.get("use_re2", False)),
             ignored_user_ids=[int(uid) for uid in ignore.get("user_ids", []) if uid],
             ignored_keywords=ignore.get("keywords", []),
             preserve_format=forwarding.get("preserve_format", True),
@@ -61,6 +83,7 @@ class ForwardingRule:
             delay=forwarding.get("delay", 0.5),
             force_forward=forwarding.get("force_forward", False),
             hide_sender=forwarding.get("hide_sender", False),
+            max_parallel_io=_parse_max_parallel_io(forwarding.get("max_parallel_io"), name),
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -77,6 +100,7 @@ class ForwardingRule:
                 "media_types": self.filter_media_types,
                 "max_file_size": self.filter_max_file_size,
                 "min_file_size": self.filter_min_file_size,
+                "use_re2": self.filter_use_re2,
             },
             "ignore": {
                 "user_ids": self.ignored_user_ids,
@@ -88,6 +112,7 @@ class ForwardingRule:
                 "delay": self.delay,
                 "force_forward": self.force_forward,
                 "hide_sender": self.hide_sender,
+                "max_parallel_io": self.max_parallel_io,
             },
         }
 
@@ -1,10 +1,17 @@
 """
 Utility functions module
 """
+import asyncio
 from telethon.tl.types import Message
 from telethon.tl import types
 from src.i18n import t
 
+# Attribute used to cache the log preview on a message object
+_PREVIEW_ATTR = "_telerelay_preview"
+
+# Newlines -> spaces in a single C-level pass
+_NEWLINE_TABLE = str.maketrans({'\n': ' ', '\r': ' '})
+
 
 def get_media_description(message: Message) -> str:
     """
@@ -49,3 +56,42 @@ def get_media_description(message: Message) -> str:
         return t("misc.media.dice")
     else:
         return t("misc.media.media")
+
+
+def get_message_preview(message: Message) -> str:
+    """
+    Get single-line message text for log previews (media description if no text)
+
+    Computed once per message and cached on it, so the received and
+    forwarded log lines of every matching rule share the same string.
+
+    Args:
+        message: Telegram message object
+
+    Returns:
+        Message text with newlines replaced by spaces
+    """
+    preview = getattr(message, _PREVIEW_ATTR, None)
+    if preview is None:
+        preview = (message.text or get_media_description(message)).translate(_NEWLINE_TABLE)
+        try:
+            setattr(message, _PREVIEW_ATTR, preview)
+        except AttributeError:
+            pass
+    return preview
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create a new event loop for a bot thread
+
+    Uses uvloop when it is installed, otherwise the default asyncio loop
+
+    Returns:
+        Event loop object
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
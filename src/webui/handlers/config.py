@@ -141,6 +141,8 @@ class ConfigHandler:
                     "mode": filter_mode,
                     "media_types": media_types or [],
                     "max_file_size": int(max_file_size * 1048576) if max_file_size else 0,
+                    # Not editable in the UI, keep the configured value
+                    "use_re2": rule.filter_use_re2,
                 },
                 "ignore": {
                     "user_ids": ignored_user_id_list,
@@ -151,7 +153,9 @@ class ConfigHandler:
                     "add_source_info": add_source_info,
                     "force_forward": force_forward,
                     "hide_sender": hide_sender,
-                    "delay": float(delay)
+                    "delay": float(delay),
+                    # Not editable in the UI, keep the configured value
+                    "max_parallel_io": rule.max_parallel_io,
                 }
             })
 